@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+asyncio 기반 포스팅 엔진
+이벤트 루프 하나에서 전체 포스팅 실행을 관리합니다.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from wp_auto_poster import WordPressAutoPoster
+
+class AsyncWordPressAutoPoster(WordPressAutoPoster):
+    def __init__(self, config_file='wp_config.json', upload_workers=None, upload_method=None):
+        """설정 파일을 로드하고 호스트별 동시 실행 한도 설정"""
+        super().__init__(config_file, upload_workers=upload_workers, upload_method=upload_method)
+
+        concurrency = self.config.get('concurrency', {})
+        self.max_concurrent_posts = concurrency.get('posts', 10)
+        self.max_concurrent_uploads = concurrency.get('uploads', self.upload_workers)
+        self.max_concurrent_rest = concurrency.get('rest', 4)
+
+        # 호스트별 한도 (REST는 WordPress 호스트, 업로드는 SFTP 호스트 기준,
+        # media 방식이면 업로드도 WordPress 호스트로 가지만 한도는 따로 적용)
+        self.wp_host = urlparse(self.wp_url).hostname
+        self.upload_host = self.wp_host if self.upload_method == 'media' else self.sftp_host
+        self.host_limits = {
+            ('rest', self.wp_host): self.max_concurrent_rest,
+            ('upload', self.upload_host): self.max_concurrent_uploads
+        }
+
+        # 업로드 동시 실행 수만큼 SFTP 세션이 필요 (media 방식이면 None)
+        self.sftp_pool = self._create_sftp_pool(self.max_concurrent_uploads)
+
+        # 블로킹 I/O(paramiko, requests)는 크기가 고정된 스레드 풀에서 실행
+        self._executor = None
+        self._semaphores = {}
+
+    def _semaphore(self, kind, host):
+        """종류/호스트별 세마포어 (루프마다 새로 생성)"""
+        key = (kind, host)
+        if key not in self._semaphores:
+            self._semaphores[key] = asyncio.Semaphore(self.host_limits[key])
+        return self._semaphores[key]
+
+    async def _run_blocking(self, kind, host, func, *args):
+        """호스트 한도 안에서 블로킹 함수를 스레드 풀로 실행"""
+        async with self._semaphore(kind, host):
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def upload_image_async(self, local_image_path, post_number, remote_filename=None):
+        """이미지 업로드 (paramiko/requests를 스레드 풀로 감싼 어댑터)"""
+        return await self._run_blocking(
+            'upload', self.upload_host,
+            self.upload_image, local_image_path, post_number, remote_filename
+        )
+
+    async def _prepare_post_images_async(self, post_number):
+        """이미지를 동시에 업로드 (작업 저널에 기록이 있으면 재사용)"""
+        if self.journal is not None:
+            image_urls = self.journal.uploaded_images(post_number)
+            if image_urls is not None:
+                print(f"  저널에 기록된 이미지 {len(image_urls)}개 사용")
+                return image_urls
+
+        local_images = self.get_post_images(post_number)
+        for img_path in local_images:
+            print(f"  이미지 업로드 중: {img_path}")
+
+        # 최적화(프로세스 풀 대기)는 이벤트 루프를 막지 않도록 스레드에서 실행
+        loop = asyncio.get_event_loop()
+        plan = await loop.run_in_executor(self._executor, self.image_upload_plan, local_images)
+        
+        # gather는 완료 순서와 관계없이 입력 순서(N-1, N-2, ...)대로 반환
+        image_urls = await asyncio.gather(*[
+            self.upload_image_async(path, post_number, remote_filename)
+            for group in plan for path, remote_filename, _ in group
+        ])
+        uploaded_images = self.group_uploaded_images(plan, image_urls)
+
+        if self.journal is not None and len(uploaded_images) == len(local_images):
+            self.journal.record_images(post_number, uploaded_images)
+        return uploaded_images
+
+    async def _process_post_async(self, post, status):
+        """포스트 하나 처리: 이미지 동시 업로드 후 포스트 생성"""
+        print(f"처리 중: 포스트 {post['number']} - {post['title']}")
+        if await self._run_blocking('rest', self.wp_host, self._is_duplicate, post):
+            return self._skipped_result(post)
+
+        uploaded_images = await self._prepare_post_images_async(post['number'])
+
+        return await self._run_blocking(
+            'rest', self.wp_host,
+            self._create_post_stage, post, uploaded_images, status
+        )
+
+    async def process_posts_async(self, txt_file, start_post=None, end_post=None, status='draft',
+                                  resume=False):
+        """포스트들을 이벤트 루프 하나에서 동시에 처리하여 WordPress에 업로드"""
+        self.start_job(txt_file, resume)
+
+        # 포스트는 워커가 필요할 때 하나씩 파싱 (범위 필터링 포함)
+        posts = self.iter_posts_from_txt(txt_file, start_post, end_post)
+        posts = self.iter_pending_posts(posts, resume)
+        posts = enumerate(posts)
+        results = {}
+
+        async def worker():
+            # 동시에 처리하는 포스트 수는 워커 수(max_concurrent_posts)로 제한
+            for index, post in posts:
+                results[index] = await self._process_post_async(post, status)
+
+        self._semaphores = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_uploads + self.max_concurrent_rest
+        )
+
+        try:
+            await asyncio.gather(*[worker() for _ in range(self.max_concurrent_posts)])
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self.close()
+
+        # 결과는 완료 순서가 아니라 포스트 순서대로 모음
+        return [results[index] for index in sorted(results)]
+
+    def run(self, txt_file, start_post=None, end_post=None, status='draft', resume=False):
+        """동기 코드에서 process_posts_async를 실행하는 래퍼"""
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(
+                self.process_posts_async(txt_file, start_post, end_post, status, resume)
+            )
+        finally:
+            loop.close()
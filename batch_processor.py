@@ -4,55 +4,82 @@
 대량의 포스트를 안전하게 처리하기 위한 배치 프로세서
 """
 
+import os
 import time
 import json
+import socket
+import itertools
+import threading
+import multiprocessing
+from contextlib import contextmanager
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 from wp_auto_poster import WordPressAutoPoster
+from rate_limiter import DEFAULT_RATE_LIMITS
+from work_queue import WorkQueue
 
 class BatchProcessor:
-    def __init__(self, config_file='wp_config.json'):
-        self.poster = WordPressAutoPoster(config_file)
+    def __init__(self, config_file='wp_config.json', upload_workers=None, upload_method=None):
+        self.config_file = config_file
+        self.poster = WordPressAutoPoster(config_file, upload_workers=upload_workers, upload_method=upload_method)
         self.batch_size = 5  # 한 번에 처리할 포스트 수
-        self.delay_between_batches = 30  # 배치 간 대기 시간 (초)
-        self.delay_between_posts = 5  # 포스트 간 대기 시간 (초)
-    
-    def process_in_batches(self, txt_file, start_post=1, end_post=None, status='draft'):
-        """배치 단위로 포스트 처리"""
+        self.delay_between_batches = 0  # 배치 간 추가 고정 대기 시간 (초)
+        self.delay_between_posts = 0  # 포스트 간 추가 고정 대기 시간 (초)
+        self.use_rest_batch = False  # 배치 하나를 WordPress 배치 API 요청으로 생성
         
-        # 전체 포스트 파싱
-        posts = self.poster.parse_posts_from_txt(txt_file)
+        # 고정 대기 대신 서버 응답에 맞춰 REST/SFTP 요청 속도를 자동 조절
+        limits = {kind: {} for kind in DEFAULT_RATE_LIMITS}
+        limits.update(self.poster.config.get('rate_limits') or {})
+        self.poster.rate_limiters = self.poster.create_rate_limiters(limits)
         
-        # 범위 필터링
-        if end_post is None:
-            end_post = max(p['number'] for p in posts)
+        # 영구 작업 큐 설정 (--enqueue / --workers 모드)
+        queue_config = self.poster.config.get('work_queue', {})
+        self.queue_file = queue_config.get('file', 'work_queue.db')
+        self.queue_lease_seconds = queue_config.get('lease_seconds', 600)
+        self.queue_max_attempts = queue_config.get('max_attempts', 3)
+        self.queue_poll_interval = queue_config.get('poll_interval', 5)
+    
+    def process_in_batches(self, txt_file, start_post=1, end_post=None, status='draft', resume=False):
+        """배치 단위로 포스트 처리 (resume이면 작업 저널에서 완료된 포스트 건너뜀)"""
+        self.poster.start_job(txt_file, resume)
         
-        posts = [p for p in posts if start_post <= p['number'] <= end_post]
+        # 포스트는 배치 단위로 필요할 때만 파싱 (범위 필터링 포함)
+        posts = self.poster.iter_posts_from_txt(txt_file, start_post, end_post)
+        posts = self.poster.iter_pending_posts(posts, resume)
+        batches = self._iter_batches(posts)
+        batch_posts = next(batches, None)
         
-        if not posts:
+        if not batch_posts:
             print("처리할 포스트가 없습니다.")
             return []
         
-        print(f"총 {len(posts)}개 포스트를 배치 크기 {self.batch_size}로 처리합니다.")
-        print(f"예상 소요 시간: {self._estimate_time(len(posts))} 분")
+        print(f"배치 크기 {self.batch_size}로 처리합니다.")
         
         all_results = []
+        batch_num = 0
         
-        # 배치 단위로 처리
-        for i in range(0, len(posts), self.batch_size):
-            batch_posts = posts[i:i + self.batch_size]
-            batch_num = (i // self.batch_size) + 1
-            total_batches = (len(posts) + self.batch_size - 1) // self.batch_size
-            
-            print(f"\n=== 배치 {batch_num}/{total_batches} 처리 중 ===")
-            print(f"포스트 범위: {batch_posts[0]['number']} ~ {batch_posts[-1]['number']}")
-            
-            batch_results = self._process_batch(batch_posts, status)
-            all_results.extend(batch_results)
-            
-            # 마지막 배치가 아니면 대기
-            if i + self.batch_size < len(posts):
-                print(f"다음 배치까지 {self.delay_between_batches}초 대기...")
-                time.sleep(self.delay_between_batches)
+        try:
+            # 배치 단위로 처리
+            while batch_posts:
+                batch_num += 1
+                
+                print(f"\n=== 배치 {batch_num} 처리 중 ===")
+                print(f"포스트 범위: {batch_posts[0]['number']} ~ {batch_posts[-1]['number']}")
+                
+                if self.use_rest_batch:
+                    batch_results = self._process_batch_rest(batch_posts, status)
+                else:
+                    batch_results = self._process_batch(batch_posts, status)
+                all_results.extend(batch_results)
+                
+                # 마지막 배치가 아니면 대기
+                batch_posts = next(batches, None)
+                if batch_posts and self.delay_between_batches:
+                    print(f"다음 배치까지 {self.delay_between_batches}초 대기...")
+                    time.sleep(self.delay_between_batches)
+        finally:
+            # 모든 배치가 같은 SFTP 연결 풀을 공유하고 마지막에 정리
+            self.poster.close()
         
         # 최종 결과 저장
         self._save_results(all_results)
@@ -60,6 +87,15 @@ class BatchProcessor:
         
         return all_results
     
+    def _iter_batches(self, posts):
+        """포스트 이터레이터를 batch_size 크기의 목록으로 묶음"""
+        posts = iter(posts)
+        while True:
+            batch_posts = list(itertools.islice(posts, self.batch_size))
+            if not batch_posts:
+                return
+            yield batch_posts
+    
     def _process_batch(self, batch_posts, status):
         """단일 배치 처리"""
         batch_results = []
@@ -67,48 +103,23 @@ class BatchProcessor:
         for i, post in enumerate(batch_posts):
             print(f"  [{i+1}/{len(batch_posts)}] 처리 중: {post['number']}. {post['title']}")
             
+            if self.poster._is_duplicate(post):
+                result = self.poster._skipped_result(post)
+                result['processed_at'] = datetime.now().isoformat()
+                batch_results.append(result)
+                continue
+            
             try:
                 # 이미지 찾기 및 업로드
-                local_images = self.poster.get_post_images(post['number'])
-                uploaded_images = []
-                
-                for img_path in local_images:
-                    print(f"    이미지 업로드: {img_path}")
-                    img_url = self.poster.upload_image_via_sftp(img_path, post['number'])
-                    if img_url:
-                        uploaded_images.append(img_url)
-                
-                # WordPress 포스트 생성
-                wp_result = self.poster.create_wp_post(
-                    title=post['title'],
-                    content=post['content'],
-                    post_number=post['number'],
-                    images=uploaded_images,
-                    status=status
-                )
+                uploaded_images = self.poster.prepare_post_images(post['number'], log_prefix='    ')
                 
-                if wp_result:
-                    print(f"    ✅ 성공: 포스트 ID {wp_result.get('id')}")
-                    batch_results.append({
-                        'post_number': post['number'],
-                        'wp_id': wp_result.get('id'),
-                        'title': post['title'],
-                        'status': 'success',
-                        'images_count': len(uploaded_images),
-                        'processed_at': datetime.now().isoformat()
-                    })
-                else:
-                    print(f"    ❌ 실패: 포스트 생성 오류")
-                    batch_results.append({
-                        'post_number': post['number'],
-                        'title': post['title'],
-                        'status': 'failed',
-                        'images_count': len(uploaded_images),
-                        'processed_at': datetime.now().isoformat()
-                    })
+                # 생성 직전 중복 확인, WordPress 포스트 생성, 포스트 표시, 작업 저널 기록
+                result = self.poster._create_post_stage(post, uploaded_images, status)
+                result['processed_at'] = datetime.now().isoformat()
+                batch_results.append(result)
                 
                 # 포스트 간 대기
-                if i < len(batch_posts) - 1:
+                if i < len(batch_posts) - 1 and self.delay_between_posts:
                     time.sleep(self.delay_between_posts)
                     
             except Exception as e:
@@ -120,24 +131,192 @@ class BatchProcessor:
                     'error': str(e),
                     'processed_at': datetime.now().isoformat()
                 })
+                self.poster.record_result(batch_results[-1])
         
         return batch_results
     
-    def _estimate_time(self, total_posts):
-        """예상 소요 시간 계산 (분)"""
-        batches = (total_posts + self.batch_size - 1) // self.batch_size
+    def _process_batch_rest(self, batch_posts, status):
+        """단일 배치 처리 (이미지 업로드 후 배치 API 요청으로 한 번에 생성)"""
+        batch_results = [None] * len(batch_posts)
+        pending = []  # (배치 내 위치, 포스트, 업로드된 이미지)
         
-        # 포스트 처리 시간 (포스트당 평균 30초 가정)
-        post_time = total_posts * 30
+        for i, post in enumerate(batch_posts):
+            print(f"  [{i+1}/{len(batch_posts)}] 처리 중: {post['number']}. {post['title']}")
+            
+            if self.poster._is_duplicate(post):
+                batch_results[i] = self.poster._skipped_result(post)
+                batch_results[i]['processed_at'] = datetime.now().isoformat()
+                continue
+            
+            try:
+                uploaded_images = self.poster.prepare_post_images(post['number'], log_prefix='    ')
+                pending.append((i, post, uploaded_images))
+            except Exception as e:
+                print(f"    ❌ 오류: {e}")
+                batch_results[i] = {
+                    'post_number': post['number'],
+                    'title': post['title'],
+                    'status': 'error',
+                    'error': str(e),
+                    'processed_at': datetime.now().isoformat()
+                }
+                self.poster.record_result(batch_results[i])
         
-        # 포스트 간 대기 시간
-        post_delays = (total_posts - 1) * self.delay_between_posts
+        # 생성 직전에 제목을 선점하므로 배치 안의 같은 제목은 한 번만 생성
+        results = self.poster._create_posts_batch_stage(
+            [post for _, post, _ in pending],
+            [uploaded_images for _, _, uploaded_images in pending],
+            status
+        )
+        
+        # 하위 응답을 원래 배치 위치의 결과로 매핑
+        for (i, _, _), result in zip(pending, results):
+            result['processed_at'] = datetime.now().isoformat()
+            batch_results[i] = result
+        
+        return batch_results
+    
+    def _work_queue(self):
+        """설정으로 작업 큐 생성"""
+        return WorkQueue(self.queue_file, self.queue_lease_seconds, self.queue_max_attempts)
+    
+    def enqueue_posts(self, txt_file, start_post=1, end_post=None, status='draft'):
+        """파싱한 포스트를 작업 큐에 넣음 (큐 이름은 사이트 URL)
+        
+        이미 큐에 있는 포스트는 다시 넣지 않고, 실패로 끝난 포스트만 다시
+        대기 상태로 돌립니다.
+        """
+        txt_path = os.path.abspath(txt_file)
+        jobs = [
+            (f"{txt_path}|{post['number']}", {'txt_file': txt_path, 'post': post, 'status': status})
+            for post in self.poster.iter_posts_from_txt(txt_file, start_post, end_post)
+        ]
         
-        # 배치 간 대기 시간
-        batch_delays = (batches - 1) * self.delay_between_batches
+        queue = self._work_queue()
+        try:
+            added, retried = queue.enqueue(self.poster.wp_url, jobs)
+        finally:
+            queue.close()
+        
+        print(f"작업 큐({self.queue_file})에 포스트 {added}개 추가, 실패한 포스트 {retried}개 다시 대기")
+        return added, retried
+    
+    def run_queue_worker(self, worker_id=None):
+        """작업 큐에서 포스트를 하나씩 임대해 처리하고 이 워커의 결과 목록 반환
+        
+        대기 중인 작업이 없고 다른 워커가 임대한 작업도 없으면 끝납니다. 다른
+        워커가 처리 중인 작업이 있으면 그 워커가 죽었을 때 이어받도록 기다립니다.
+        """
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        queue_name = self.poster.wp_url
+        queue = self._work_queue()
+        results = []
+        current_file = None
+        
+        try:
+            while True:
+                job = queue.claim(queue_name, worker_id)
+                if job is None:
+                    if not queue.counts(queue_name).get('leased'):
+                        break
+                    time.sleep(self.queue_poll_interval)
+                    continue
+                
+                # 포스트 파일이 바뀌면 그 파일의 작업 저널로 전환 (이전 기록 유지)
+                if job['payload']['txt_file'] != current_file:
+                    current_file = job['payload']['txt_file']
+                    self.poster.start_job(current_file, resume=True)
+                
+                print(f"[{worker_id}] 작업 {job['id']} (시도 {job['attempts']}회)")
+                results.append(self._process_queue_job(queue, job, worker_id))
+        finally:
+            queue.close()
+            self.poster.close()
         
-        total_seconds = post_time + post_delays + batch_delays
-        return round(total_seconds / 60, 1)
+        return results
+    
+    def _process_queue_job(self, queue, job, worker_id):
+        """임대한 작업 하나를 처리하고 큐에 완료/실패 기록"""
+        post = job['payload']['post']
+        
+        # 이전 워커가 결과를 남기지 못하고 죽었으면 포스트를 만들었을 수 있으므로
+        # 저널이나 제목으로 확인해 다시 만들지 않음 (실패가 기록된 재시도는 확인 안 함)
+        result = None
+        if self.poster.journal is not None:
+            result = self.poster.journal.finished_result(post['number'])
+        if result is None and job['expired'] and self.poster.site_has_title(post['title']):
+            result = self.poster._skipped_result(post)
+        if result is None:
+            with self._lease_heartbeat(queue, job['id'], worker_id):
+                result = self._process_batch([post], job['payload']['status'])[0]
+        
+        if result['status'] in ('success', 'skipped_duplicate'):
+            recorded = queue.complete(job['id'], worker_id, result)
+        else:
+            recorded = queue.fail(job, worker_id, result)
+        if not recorded:
+            print(f"    임대 시간이 지나 다른 워커가 가져간 작업입니다: {job['id']}")
+        return result
+    
+    @contextmanager
+    def _lease_heartbeat(self, queue, job_id, worker_id):
+        """처리하는 동안 임대 시간의 1/3마다 임대 연장"""
+        stop = threading.Event()
+        
+        def renew():
+            while not stop.wait(self.queue_lease_seconds / 3):
+                try:
+                    if not queue.extend(job_id, worker_id):
+                        print(f"    임대 연장 실패 (작업 {job_id}): 다른 워커가 가져갔습니다")
+                        return
+                except Exception as e:
+                    print(f"    임대 연장 오류 (작업 {job_id}): {e}")
+        
+        thread = threading.Thread(target=renew, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+    
+    def run_queue_workers(self, workers=1, skip_duplicates=False):
+        """워커 프로세스 workers개로 작업 큐를 처리하고 큐 전체 결과 반환
+        
+        워커마다 설정 파일로 포스터(연결 풀, 속도 제한 포함)를 새로 만듭니다.
+        """
+        if workers <= 1:
+            self.run_queue_worker()
+        else:
+            # 부모 프로세스의 연결은 쓰지 않으므로 먼저 정리
+            self.poster.close()
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                futures = [
+                    executor.submit(
+                        _queue_worker_main, self.config_file, self.queue_file, self.poster.upload_workers,
+                        self.poster.upload_method, skip_duplicates, f"{socket.gethostname()}:{os.getpid()}-{i + 1}"
+                    )
+                    for i in range(workers)
+                ]
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"워커 프로세스 오류: {e}")
+        
+        queue = self._work_queue()
+        try:
+            counts = queue.counts(self.poster.wp_url)
+            results = queue.results(self.poster.wp_url)
+        finally:
+            queue.close()
+        
+        print("\n작업 큐 상태: " + ', '.join(f"{state} {count}개" for state, count in sorted(counts.items())))
+        if results:
+            self._save_results(results)
+            self._print_summary(results)
+        return results
     
     def _save_results(self, results):
         """결과를 JSON 파일로 저장"""
@@ -152,12 +331,15 @@ class BatchProcessor:
         success = len([r for r in results if r['status'] == 'success'])
         failed = len([r for r in results if r['status'] == 'failed'])
         error = len([r for r in results if r['status'] == 'error'])
+        skipped = len([r for r in results if r['status'] == 'skipped_duplicate'])
         
         print(f"\n=== 배치 처리 완료 ===")
         print(f"총 처리: {total}개")
         print(f"성공: {success}개")
         print(f"실패: {failed}개")
         print(f"오류: {error}개")
+        if skipped:
+            print(f"중복으로 건너뜀: {skipped}개")
         print(f"성공률: {(success/total*100):.1f}%")
         
         if failed > 0 or error > 0:
@@ -166,6 +348,13 @@ class BatchProcessor:
                 if result['status'] in ['failed', 'error']:
                     print(f"  - {result['post_number']}. {result['title']}")
 
+def _queue_worker_main(config_file, queue_file, upload_workers, upload_method, skip_duplicates, worker_id):
+    """워커 프로세스 진입점 (처리한 작업 수 반환)"""
+    processor = BatchProcessor(config_file, upload_workers=upload_workers, upload_method=upload_method)
+    processor.queue_file = queue_file
+    processor.poster.skip_duplicates = processor.poster.skip_duplicates or skip_duplicates
+    return len(processor.run_queue_worker(worker_id))
+
 def main():
     """메인 실행 함수"""
     import argparse
@@ -177,22 +366,52 @@ def main():
     parser.add_argument('--status', default='draft', choices=['draft', 'publish'], 
                        help='포스트 상태')
     parser.add_argument('--batch-size', type=int, default=5, help='배치 크기')
-    parser.add_argument('--batch-delay', type=int, default=30, help='배치 간 대기 시간(초)')
-    parser.add_argument('--post-delay', type=int, default=5, help='포스트 간 대기 시간(초)')
+    parser.add_argument('--batch-delay', type=float, default=0,
+                       help='배치 간 추가 고정 대기 시간(초, 요청 속도는 rate_limits로 자동 조절)')
+    parser.add_argument('--post-delay', type=float, default=0, help='포스트 간 추가 고정 대기 시간(초)')
+    parser.add_argument('--upload-workers', type=int, help='이미지 동시 업로드 워커 수')
+    parser.add_argument('--upload-method', choices=['sftp', 'media'],
+                       help='이미지 업로드 방식 (media: WordPress 미디어 라이브러리, SFTP 불필요)')
+    parser.add_argument('--resume', action='store_true',
+                       help='작업 저널을 보고 완료된 포스트는 건너뛰고 실패한 것만 다시 처리')
+    parser.add_argument('--skip-duplicates', action='store_true',
+                       help='같은 제목의 포스트가 이미 있으면 건너뜀 (데이터베이스 접근 필요)')
+    parser.add_argument('--rest-batch', action='store_true',
+                       help='배치마다 WordPress 배치 API 요청으로 포스트 생성 (배치 크기 최대 25 권장)')
+    parser.add_argument('--enqueue', action='store_true',
+                       help='포스트를 처리하지 않고 작업 큐에 넣음 (--workers와 함께 쓰면 넣은 뒤 바로 처리)')
+    parser.add_argument('--workers', type=int, metavar='N',
+                       help='작업 큐를 워커 프로세스 N개로 처리 (다른 호스트에서도 같은 큐 파일로 실행 가능)')
+    parser.add_argument('--queue-file', help='작업 큐 파일 (기본값: 설정의 work_queue.file)')
     
     args = parser.parse_args()
     
     try:
-        processor = BatchProcessor()
+        processor = BatchProcessor(upload_workers=args.upload_workers, upload_method=args.upload_method)
         processor.batch_size = args.batch_size
         processor.delay_between_batches = args.batch_delay
         processor.delay_between_posts = args.post_delay
+        processor.use_rest_batch = args.rest_batch
+        processor.poster.skip_duplicates = processor.poster.skip_duplicates or args.skip_duplicates
+        if args.queue_file:
+            processor.queue_file = args.queue_file
+        
+        if args.enqueue or args.workers:
+            # 작업 큐 모드: 넣기(생산자)와 처리(워커)를 따로 또는 함께 실행
+            if args.enqueue:
+                processor.enqueue_posts(args.txt_file, args.start, args.end, args.status)
+            if args.workers:
+                processor.run_queue_workers(args.workers, skip_duplicates=args.skip_duplicates)
+            else:
+                processor.poster.close()
+            return
         
         processor.process_in_batches(
             txt_file=args.txt_file,
             start_post=args.start,
             end_post=args.end,
-            status=args.status
+            status=args.status,
+            resume=args.resume
         )
         
     except FileNotFoundError:
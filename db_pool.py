@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+MySQL 연결 풀
+WordPressUtils와 WordPressAutoPoster가 같은 설정이면 하나의 연결 풀을
+공유해, 작업마다 새로 연결하는 비용을 줄입니다.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import pooling
+
+
+class DatabasePool:
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    @classmethod
+    def for_config(cls, db_config):
+        """같은 데이터베이스 설정이면 같은 풀 객체를 반환"""
+        key = tuple(sorted((k, str(v)) for k, v in db_config.items()))
+        with cls._pools_lock:
+            if key not in cls._pools:
+                cls._pools[key] = cls(db_config)
+            return cls._pools[key]
+
+    def __init__(self, db_config):
+        """설정만 저장하고 실제 연결은 처음 사용할 때 생성
+
+        db_config의 pool_size(기본값 5)와 pool_timeout(초, 기본값 30)은
+        풀 설정으로 쓰이고 나머지는 mysql.connector 연결 인자로 전달됩니다.
+        connection_timeout(초)이 없으면 10초로 설정해, 방화벽에 막힌 서버에서
+        OS TCP 타임아웃까지 멈추지 않게 합니다.
+        """
+        self.db_config = dict(db_config)
+        self.pool_size = self.db_config.pop('pool_size', 5)
+        self.pool_timeout = self.db_config.pop('pool_timeout', 30)
+        self.db_config.setdefault('connection_timeout', 10)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        """연결 풀 (MySQLConnectionPool은 생성 시 연결을 모두 열므로 지연 생성)"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = pooling.MySQLConnectionPool(
+                    pool_size=self.pool_size,
+                    **self.db_config
+                )
+            return self._pool
+
+    def get_connection(self):
+        """풀에서 연결을 빌림 (close()하면 풀로 반납)
+
+        풀이 모두 사용 중이면 pool_timeout 동안 반납을 기다립니다.
+        """
+        pool = self._get_pool()
+        deadline = time.time() + self.pool_timeout
+        while True:
+            try:
+                return pool.get_connection()
+            except mysql.connector.errors.PoolError:
+                if time.time() >= deadline:
+                    raise
+                time.sleep(0.05)
+
+    @contextmanager
+    def connection(self):
+        """풀에서 연결을 빌려 사용한 뒤 예외가 나도 반드시 반납"""
+        conn = self.get_connection()
+        try:
+            yield conn
+        except Exception:
+            # 커밋하지 않은 변경은 되돌린 뒤 반납
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            conn.close()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+업로드 전 이미지 최적화
+최대 크기로 줄이고 EXIF를 제거해 다시 압축(선택적으로 WebP)하며, srcset용
+작은 변형도 만듭니다. 작업은 프로세스 풀에서 코어마다 나눠 실행하고, 결과는
+원본 내용 해시별로 캐시 폴더에 보관합니다.
+"""
+
+import os
+import json
+import hashlib
+import threading
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _optimize_image(job):
+    """이미지 하나를 최적화해 [(출력 경로, 너비), ...]를 큰 것부터 반환 (프로세스 풀에서 실행)
+
+    애니메이션 이미지는 변환하지 않고 None을 반환합니다.
+    """
+    source, prefix, max_dimension, srcset_widths, quality, webp = job
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as original:
+        if getattr(original, 'is_animated', False):
+            return None
+
+        # 회전 정보를 픽셀에 반영 (저장할 때 EXIF는 넘기지 않으므로 제거됨)
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        if webp:
+            image_format, extension, options = 'WEBP', 'webp', {'quality': quality, 'method': 4}
+        elif has_alpha:
+            image_format, extension, options = 'PNG', 'png', {'optimize': True}
+        else:
+            image_format, extension, options = 'JPEG', 'jpg', {'quality': quality, 'optimize': True, 'progressive': True}
+        image = image.convert('RGBA' if has_alpha and image_format != 'JPEG' else 'RGB')
+
+        scale = min(1.0, max_dimension / max(image.width, image.height))
+        main_width = max(1, round(image.width * scale))
+        widths = sorted({main_width} | {w for w in srcset_widths if w < main_width}, reverse=True)
+
+        variants = []
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            path = f"{prefix}-{width}w.{extension}"
+            resized.save(path + '.tmp', image_format, **options)
+            os.replace(path + '.tmp', path)
+            variants.append((path, width))
+        return variants
+
+
+class ImageOptimizer:
+    def __init__(self, cache_dir='optimized_images', max_dimension=1600, quality=82, webp=False,
+                 srcset_widths=(480, 960), workers=None, file_hash=None):
+        """최적화 설정 (Pillow 필요)
+
+        file_hash는 원본 내용 해시 함수로, 업로드 캐시의 해시 함수를 넘기면
+        크기/수정 시각이 같은 파일은 다시 읽지 않습니다.
+        """
+        if importlib.util.find_spec('PIL') is None:
+            raise RuntimeError("이미지 최적화에는 Pillow 패키지가 필요합니다: pip install Pillow")
+
+        self.cache_dir = cache_dir
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self.webp = webp
+        self.srcset_widths = sorted(set(srcset_widths))
+        self.workers = workers or os.cpu_count() or 1
+        self.file_hash = file_hash or self._file_hash
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+        # 설정이 바뀌면 캐시 키도 바뀌어 다시 최적화
+        settings = json.dumps([max_dimension, quality, webp, self.srcset_widths])
+        self.settings_key = hashlib.sha256(settings.encode()).hexdigest()[:8]
+
+    @staticmethod
+    def _file_hash(path):
+        """파일 내용 SHA-256"""
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                sha256.update(block)
+        return sha256.hexdigest()
+
+    def _cached(self, manifest_file):
+        """캐시된 변형 목록 (파일이 하나라도 없으면 None)"""
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                variants = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if variants and not all(os.path.exists(path) for path, _ in variants):
+            return None
+        return variants
+
+    def optimize(self, paths):
+        """이미지들을 최적화해 경로 순서대로 변형 목록 반환
+
+        각 항목은 [(파일 경로, 너비), ...] (큰 것부터)이며, 최적화하지 않은
+        이미지(애니메이션, 오류)는 None입니다.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        results = [None] * len(paths)
+        jobs = {}
+
+        for i, path in enumerate(paths):
+            try:
+                prefix = os.path.join(self.cache_dir, f"{self.file_hash(path)[:16]}-{self.settings_key}")
+            except OSError as e:
+                print(f"이미지 최적화 실패: {path}, 오류: {e}")
+                continue
+            cached = self._cached(prefix + '.json')
+            if cached is not None:
+                results[i] = [tuple(variant) for variant in cached] or None
+                continue
+            jobs[i] = prefix
+
+        if jobs:
+            # 여러 스레드가 동시에 호출해도 프로세스 풀은 하나만 생성
+            # (스레드가 도는 중에 fork하면 잠금이 복사돼 멈출 수 있으므로 spawn 사용)
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                    )
+                executor = self._executor
+            futures = {
+                i: executor.submit(
+                    _optimize_image,
+                    (paths[i], prefix, self.max_dimension, self.srcset_widths, self.quality, self.webp)
+                )
+                for i, prefix in jobs.items()
+            }
+            for i, future in futures.items():
+                try:
+                    variants = future.result()
+                except Exception as e:
+                    print(f"이미지 최적화 실패: {paths[i]}, 오류: {e}")
+                    continue
+                with open(jobs[i] + '.json', 'w', encoding='utf-8') as f:
+                    json.dump(variants or [], f)
+                results[i] = variants
+
+        return results
+
+    def close(self):
+        """프로세스 풀 종료"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+작업 저널
+포스트마다 진행 상태(이미지 업로드, WordPress 포스트 ID, 결과)를 단계가
+끝날 때마다 SQLite 파일에 기록해, 중단된 실행을 이어서 할 수 있게 합니다.
+"""
+
+import json
+from datetime import datetime
+from sqlite_store import SQLiteStore
+
+
+class JobJournal(SQLiteStore):
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS posts (
+            job_key TEXT NOT NULL,
+            post_number INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            image_urls TEXT,
+            wp_id INTEGER,
+            result TEXT,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (job_key, post_number)
+        );
+    """
+
+    def __init__(self, db_file='job_journal.db'):
+        """저널 파일 경로 설정 (작업은 start()로 지정)"""
+        super().__init__(db_file)
+        self.job_key = None
+
+    def start(self, job_key):
+        """작업 시작 (이전 기록은 유지하며, 다시 처리할 포스트는 forget()으로 지움)"""
+        self.job_key = job_key
+
+    def forget(self, post_number):
+        """현재 작업에서 포스트 하나의 이전 기록 삭제"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "DELETE FROM posts WHERE job_key = ? AND post_number = ?", (self.job_key, post_number)
+            )
+            conn.commit()
+
+    def _get(self, post_number):
+        """현재 작업의 포스트 행 조회"""
+        with self._lock:
+            return self._connection().execute(
+                "SELECT state, image_urls, result FROM posts WHERE job_key = ? AND post_number = ?",
+                (self.job_key, post_number)
+            ).fetchone()
+
+    def finished_result(self, post_number):
+        """성공적으로 끝난 포스트의 결과 (없으면 None)"""
+        row = self._get(post_number)
+        if row is None or row[0] != 'success':
+            return None
+        return json.loads(row[2])
+
+    def uploaded_images(self, post_number):
+        """모든 이미지 업로드가 끝난 포스트의 URL 목록 (없으면 None)"""
+        row = self._get(post_number)
+        if row is None or row[1] is None:
+            return None
+        return json.loads(row[1])
+
+    def _update(self, post_number, **fields):
+        """포스트 행을 만들거나 갱신하고 바로 커밋"""
+        fields['updated_at'] = datetime.now().isoformat()
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR IGNORE INTO posts (job_key, post_number, state, updated_at) VALUES (?, ?, 'pending', ?)",
+                (self.job_key, post_number, fields['updated_at'])
+            )
+            conn.execute(
+                f"UPDATE posts SET {assignments} WHERE job_key = ? AND post_number = ?",
+                list(fields.values()) + [self.job_key, post_number]
+            )
+            conn.commit()
+
+    def record_images(self, post_number, image_urls):
+        """이미지 업로드 완료 기록"""
+        self._update(post_number, state='images_uploaded', image_urls=json.dumps(image_urls))
+
+    def record_result(self, post_number, result):
+        """포스트 처리 결과 기록 (상태는 결과의 status)"""
+        self._update(
+            post_number,
+            state=result['status'],
+            wp_id=result.get('wp_id'),
+            result=json.dumps(result, ensure_ascii=False)
+        )
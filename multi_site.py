@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+여러 사이트 동시 포스팅
+같은 post.txt를 설정 파일의 sites 목록에 있는 모든 WordPress 사이트에
+올립니다. 포스트 파싱과 이미지 최적화는 한 번만 하고, 업로드와 포스트
+생성은 사이트마다 별도 스레드에서 동시에 진행합니다.
+"""
+
+import os
+import re
+import json
+from datetime import datetime
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from wp_auto_poster import WordPressAutoPoster
+
+class MultiSitePoster:
+    def __init__(self, config_file='wp_config.json', site_names=None):
+        """설정 파일의 sites 목록으로 사이트별 설정 생성
+
+        sites의 각 항목은 공통 설정(sites 밖의 항목)을 덮어쓰는 값만 적으면
+        됩니다. site_names를 주면 그 이름의 사이트만 사용합니다.
+        """
+        with open(config_file, 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+
+        sites = self.config.get('sites') or []
+        if not sites:
+            raise ValueError("설정 파일에 sites 목록이 없습니다")
+
+        base_config = {key: value for key, value in self.config.items() if key not in ('sites', 'multi_site')}
+        self.site_configs = {}
+        for site in sites:
+            site_config = self._merge(base_config, {key: value for key, value in site.items() if key != 'name'})
+            name = site.get('name') or urlparse(site_config['wordpress']['url']).hostname
+            self.site_configs[name] = site_config
+
+        if site_names:
+            unknown = [name for name in site_names if name not in self.site_configs]
+            if unknown:
+                raise ValueError(f"설정에 없는 사이트입니다: {', '.join(unknown)}")
+            self.site_configs = {name: self.site_configs[name] for name in site_names}
+
+        multi_site = self.config.get('multi_site', {})
+        self.max_parallel_sites = multi_site.get('max_parallel_sites', len(self.site_configs))
+        self.results_dir = multi_site.get('results_dir', 'site_results')
+
+    @classmethod
+    def _merge(cls, base, override):
+        """딕셔너리를 재귀적으로 합침 (override 값 우선)"""
+        merged = dict(base)
+        for key, value in override.items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = cls._merge(merged[key], value)
+            else:
+                merged[key] = value
+        return merged
+
+    def _create_posters(self, upload_workers=None, upload_method=None):
+        """사이트별 포스터 생성 (설정 오류가 있는 사이트는 오류 메시지로 기록)"""
+        posters = {}
+        errors = {}
+        for name, site_config in self.site_configs.items():
+            try:
+                posters[name] = WordPressAutoPoster(
+                    upload_workers=upload_workers, upload_method=upload_method, config=site_config
+                )
+            except Exception as e:
+                print(f"[{name}] 설정 오류: {e}")
+                errors[name] = str(e)
+        return posters, errors
+
+    def _prepare_images(self, poster, posts):
+        """모든 포스트의 이미지를 한 번만 최적화 (사이트별 포스터는 캐시를 사용)"""
+        if poster.image_optimizer is None:
+            return
+
+        local_images = [img for post in posts for img in poster.get_post_images(post['number'])]
+        if local_images:
+            print(f"이미지 {len(local_images)}개 최적화 중...")
+            poster.image_optimizer.optimize(local_images)
+        poster.image_optimizer.close()
+
+    def run(self, txt_file, start_post=None, end_post=None, status='draft', pipeline=False,
+            rest_batch_size=None, resume=False, upload_workers=None, upload_method=None):
+        """모든 사이트에 포스팅하고 사이트별 결과 반환 ({이름: 결과 목록 또는 오류 딕셔너리})"""
+        posters, errors = self._create_posters(upload_workers, upload_method)
+        site_results = {name: {'error': error} for name, error in errors.items()}
+        if not posters:
+            return site_results
+
+        # 파싱과 이미지 최적화는 한 번만
+        first_poster = next(iter(posters.values()))
+        posts = list(first_poster.iter_posts_from_txt(txt_file, start_post, end_post))
+        print(f"포스트 {len(posts)}개를 사이트 {len(posters)}곳에 올립니다.")
+        self._prepare_images(first_poster, posts)
+
+        def run_site(name, poster):
+            # 사이트마다 포스트 사본 사용 (중복 표시 등이 다른 사이트에 섞이지 않도록)
+            try:
+                return poster.process_posts(
+                    txt_file, status=status, pipeline=pipeline, rest_batch_size=rest_batch_size,
+                    resume=resume, posts=[dict(post) for post in posts]
+                )
+            except Exception as e:
+                print(f"[{name}] 처리 중 오류: {e}")
+                return {'error': str(e)}
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_parallel_sites)) as executor:
+            futures = {name: executor.submit(run_site, name, poster) for name, poster in posters.items()}
+            for name, future in futures.items():
+                site_results[name] = future.result()
+
+        self._save_results(site_results)
+        self._print_summary(site_results)
+        return site_results
+
+    def _save_results(self, site_results):
+        """사이트별 결과를 각각 JSON 파일로 저장"""
+        os.makedirs(self.results_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        for name, results in site_results.items():
+            safe_name = re.sub(r'[^\w.-]', '_', name)
+            filename = os.path.join(self.results_dir, f"{safe_name}_results_{timestamp}.json")
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n사이트별 결과가 {self.results_dir}/에 저장되었습니다.")
+
+    def _print_summary(self, site_results):
+        """사이트별 성공 수 요약 출력"""
+        print(f"\n=== 사이트별 처리 결과 ===")
+        for name, results in site_results.items():
+            if isinstance(results, dict):
+                print(f"  {name}: 오류 - {results['error']}")
+                continue
+            success = len([r for r in results if r['status'] == 'success'])
+            print(f"  {name}: 성공 {success}/{len(results)}")
+
+def main():
+    """메인 실행 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='여러 WordPress 사이트에 동시 포스팅')
+    parser.add_argument('--txt-file', default='post.txt', help='포스트 텍스트 파일')
+    parser.add_argument('--start', type=int, help='시작 포스트 번호')
+    parser.add_argument('--end', type=int, help='끝 포스트 번호')
+    parser.add_argument('--status', default='draft', choices=['draft', 'publish'],
+                       help='포스트 상태 (draft 또는 publish)')
+    parser.add_argument('--config', default='wp_config.json', help='설정 파일')
+    parser.add_argument('--sites', nargs='+', help='포스팅할 사이트 이름 (기본값: 모든 사이트)')
+    parser.add_argument('--upload-workers', type=int, help='사이트별 이미지 동시 업로드 워커 수')
+    parser.add_argument('--upload-method', choices=['sftp', 'media'], help='이미지 업로드 방식')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='다음 포스트의 이미지 업로드와 현재 포스트 생성을 겹쳐 실행')
+    parser.add_argument('--rest-batch', type=int, metavar='N', help='배치 API로 N개씩 묶어 포스트 생성')
+    parser.add_argument('--resume', action='store_true',
+                       help='사이트별 작업 저널을 보고 완료된 포스트는 건너뜀')
+
+    args = parser.parse_args()
+
+    try:
+        poster = MultiSitePoster(args.config, site_names=args.sites)
+        poster.run(
+            txt_file=args.txt_file,
+            start_post=args.start,
+            end_post=args.end,
+            status=args.status,
+            pipeline=args.pipeline,
+            rest_batch_size=args.rest_batch,
+            resume=args.resume,
+            upload_workers=args.upload_workers,
+            upload_method=args.upload_method
+        )
+
+    except FileNotFoundError:
+        print(f"설정 파일을 찾을 수 없습니다: {args.config}")
+    except Exception as e:
+        print(f"오류 발생: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+포스트 파일 오프셋 인덱스
+post.txt 옆에 포스트 번호 → (바이트 오프셋, 길이) 인덱스를 저장해
+필요한 범위의 포스트만 바로 읽을 수 있게 합니다.
+"""
+
+import os
+import json
+
+INDEX_VERSION = 1
+SEPARATORS = (b'-----\r\n', b'-----\n')
+
+
+class PostIndex:
+    def __init__(self, txt_file, parse_chunk, index_file=None):
+        """인덱스 파일 경로 설정 (기본값: <txt_file>.idx)
+
+        parse_chunk는 구분선 사이의 텍스트를 포스트 딕셔너리(또는 None)로
+        바꾸는 함수로, 인덱스와 스트리밍 파서가 같은 규칙을 쓰도록 합니다.
+        """
+        self.txt_file = txt_file
+        self.parse_chunk = parse_chunk
+        self.index_file = index_file or f"{txt_file}.idx"
+        self.entries = None
+
+    def _file_signature(self):
+        """파일 변경 여부를 판단할 크기/수정 시각"""
+        stat = os.stat(self.txt_file)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def load(self):
+        """인덱스를 읽고, 없거나 파일이 바뀌었으면 다시 생성"""
+        signature = self._file_signature()
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if (data.get('version') == INDEX_VERSION
+                    and data.get('size') == signature['size']
+                    and data.get('mtime_ns') == signature['mtime_ns']):
+                self.entries = data['entries']
+                return self.entries
+        except (OSError, ValueError, KeyError):
+            pass
+
+        self.build(signature)
+        return self.entries
+
+    def build(self, signature=None):
+        """파일을 한 번 훑어 [번호, 오프셋, 길이] 목록을 만들고 저장"""
+        signature = signature or self._file_signature()
+        entries = []
+
+        with open(self.txt_file, 'rb') as f:
+            offset = 0
+            chunk_start = 0
+            chunk = []
+            for line in f:
+                separator = next((sep for sep in SEPARATORS if line.endswith(sep)), None)
+                if separator is None:
+                    chunk.append(line)
+                    offset += len(line)
+                    continue
+
+                chunk.append(line[:-len(separator)])
+                self._add_entry(entries, b''.join(chunk), chunk_start)
+                offset += len(line)
+                chunk_start = offset
+                chunk = []
+
+            # 마지막 포스트 (구분선 없이 끝나는 경우)
+            self._add_entry(entries, b''.join(chunk), chunk_start)
+
+        self.entries = entries
+        try:
+            with open(self.index_file, 'w', encoding='utf-8') as f:
+                json.dump(dict(version=INDEX_VERSION, entries=entries, **signature), f)
+        except OSError as e:
+            # 인덱스를 저장할 수 없어도 이번 실행에서는 메모리의 인덱스 사용
+            print(f"인덱스 저장 실패: {self.index_file}, 오류: {e}")
+        return entries
+
+    def _add_entry(self, entries, chunk, offset):
+        """덩어리 하나를 파싱해 포스트이면 인덱스에 추가"""
+        post = self.parse_chunk(self._decode(chunk))
+        if post is not None:
+            entries.append([post['number'], offset, len(chunk)])
+
+    @staticmethod
+    def _decode(chunk):
+        """바이트를 텍스트 모드로 읽은 것과 같은 문자열로 변환 (줄바꿈 통일)"""
+        return chunk.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+    def iter_chunks(self, start_post=None, end_post=None):
+        """범위에 해당하는 포스트 텍스트만 파일 순서대로 바로 읽어옴"""
+        if self.entries is None:
+            self.load()
+
+        with open(self.txt_file, 'rb') as f:
+            for number, offset, length in self.entries:
+                if start_post is not None and number < start_post:
+                    continue
+                if end_post is not None and number > end_post:
+                    continue
+                f.seek(offset)
+                yield self._decode(f.read(length))
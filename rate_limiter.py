@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+적응형 요청 속도 제한
+토큰 버킷으로 요청 간격을 지키고, 응답이 빠르고 성공하면 속도를 조금씩
+올리며(가산 증가) 429/5xx, Retry-After, 지연 증가에는 크게 낮춥니다(배수 감소).
+"""
+
+import time
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# 엔드포인트별 기본값 (rate는 초당 요청 수)
+DEFAULT_RATE_LIMITS = {
+    'rest': {'rate': 1.0, 'min_rate': 0.05, 'max_rate': 5.0, 'latency_target': 5.0},
+    'sftp': {'rate': 5.0, 'min_rate': 0.5, 'max_rate': 20.0, 'latency_target': 10.0},
+    'media': {'rate': 2.0, 'min_rate': 0.1, 'max_rate': 10.0, 'latency_target': 10.0}
+}
+
+
+def parse_retry_after(value):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 초로 변환 (해석할 수 없으면 None)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, name, rate=1.0, min_rate=0.05, max_rate=5.0, increase=0.1, decrease=0.5,
+                 burst=1, latency_target=None, latency_factor=2.0, latency_floor=0.5):
+        """속도 제한 설정
+
+        increase는 성공할 때마다 더하는 초당 요청 수, decrease는 실패나 지연
+        증가 시 곱하는 비율입니다. latency_target(초)을 넘거나 평균 지연의
+        latency_factor배를 넘는 응답은 느린 응답으로 보고 속도를 낮춥니다
+        (latency_floor초 미만의 응답은 항상 빠른 응답으로 봄).
+        """
+        self.name = name
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst
+        self.latency_target = latency_target
+        self.latency_factor = latency_factor
+        self.latency_floor = latency_floor
+
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._latency_avg = None
+        self._last_decrease = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 예약하고 차례가 올 때까지 대기"""
+        with self._lock:
+            now = time.monotonic()
+            # _updated가 미래이면 Retry-After 대기 중 (그동안 토큰이 쌓이지 않음)
+            self._tokens = min(self.burst, self._tokens + max(0, now - self._updated) * self.rate)
+            self._updated = max(now, self._updated)
+            self._tokens -= 1
+            wait = (self._updated - now) + max(0, -self._tokens) / self.rate
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def record(self, success, latency=None, retry_after=None):
+        """요청 결과를 반영해 속도 조정
+
+        success는 서버 과부하 신호(429/5xx/연결 오류)가 없었는지 여부입니다.
+        """
+        with self._lock:
+            slow = False
+            if latency is not None and latency >= self.latency_floor:
+                if self.latency_target and latency > self.latency_target:
+                    slow = True
+                elif self._latency_avg and latency > self._latency_avg * self.latency_factor:
+                    slow = True
+            if latency is not None:
+                self._latency_avg = latency if self._latency_avg is None else (
+                    self._latency_avg * 0.8 + latency * 0.2
+                )
+
+            if retry_after:
+                # 서버가 알려준 시각까지 새 요청을 보내지 않음
+                self._updated = max(self._updated, time.monotonic() + retry_after)
+                self._tokens = min(self._tokens, 0)
+
+            if success and not slow and not retry_after:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                return
+
+            # 동시에 실패한 요청들로 여러 번 낮추지 않도록 간격을 둠
+            now = time.monotonic()
+            if now - self._last_decrease < max(1.0, 1 / self.rate):
+                return
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            print(f"  요청 속도 낮춤 ({self.name}): 초당 {self.rate:.2f}회")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+재시도 정책
+일시적인 오류만 골라 지수 백오프(상한, 지터 포함)로 다시 시도하고,
+실행 전체의 재시도 횟수(예산)를 제한해 장애 시 재시도가 폭주하지 않게 합니다.
+"""
+
+import time
+import random
+import threading
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=4, base_delay=1.0, max_delay=30.0, budget=100):
+        """재시도 설정
+
+        max_attempts는 첫 시도를 포함한 최대 시도 횟수, budget은 실행 전체에서
+        허용하는 재시도 횟수입니다 (None이면 제한 없음).
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retries_used = 0
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt):
+        """attempt번째 재시도 전 대기 시간 (상한이 있는 지수 백오프 + 전체 지터)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _take_budget(self):
+        """재시도 예산에서 한 번 차감 (남은 예산이 없으면 False)"""
+        with self._lock:
+            if self.budget is not None and self.retries_used >= self.budget:
+                return False
+            self.retries_used += 1
+            return True
+
+    def call(self, func, retry_on=None, retry_result=None, label='요청'):
+        """func()를 실행하고 일시적인 실패면 다시 시도
+
+        retry_on(예외)이 True인 예외와, retry_result(결과)가 None이 아닌 결과를
+        재시도합니다. retry_result는 서버가 요청한 최소 대기 시간(초, 없으면 0)을
+        반환합니다. 재시도할 수 없게 되면 마지막 예외를 다시 발생시키거나
+        마지막 결과를 그대로 반환합니다.
+        """
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                result = func()
+            except Exception as e:
+                if not (retry_on and retry_on(e)):
+                    raise
+                if not self._can_retry(attempt):
+                    raise
+                reason = e
+            else:
+                retry_after = retry_result(result) if retry_result else None
+                if retry_after is None or not self._can_retry(attempt):
+                    return result
+                # HTTP 응답이면 상태 코드만 표시
+                reason = getattr(result, 'status_code', result)
+
+            delay = max(self.backoff(attempt), retry_after or 0)
+            attempt += 1
+            print(f"  재시도 {attempt}/{self.max_attempts - 1} ({label}): {delay:.1f}초 후, 원인: {reason}")
+            time.sleep(delay)
+
+    def _can_retry(self, attempt):
+        """시도 횟수와 실행 전체 예산이 남았는지 확인"""
+        if attempt + 1 >= self.max_attempts:
+            return False
+        if not self._take_budget():
+            print("  재시도 예산을 모두 사용해 더 이상 재시도하지 않습니다")
+            return False
+        return True
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+SFTP 연결 풀
+이미지마다 SSH 핸드셰이크를 반복하지 않도록 SFTP 세션을 재사용합니다.
+"""
+
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+import paramiko
+
+
+class _PooledConnection:
+    """SSH 클라이언트와 SFTP 세션 한 쌍"""
+
+    def __init__(self, ssh, sftp):
+        self.ssh = ssh
+        self.sftp = sftp
+
+    def is_alive(self):
+        """전송 계층이 살아 있는지 확인 (헬스 체크)"""
+        transport = self.ssh.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        channel = self.sftp.get_channel()
+        return channel is not None and not channel.closed
+
+    def close(self):
+        """세션 종료 (이미 끊긴 경우 무시)"""
+        for closable in (self.sftp, self.ssh):
+            try:
+                closable.close()
+            except Exception:
+                pass
+
+
+class SFTPConnectionPool:
+    def __init__(self, host, username, port=22, password=None, private_key=None,
+                 pool_size=4, keepalive=30):
+        """연결 정보만 저장하고 실제 연결은 처음 사용할 때 생성"""
+        self.host = host
+        self.username = username
+        self.port = port
+        self.password = password
+        self.private_key = private_key
+        self.pool_size = max(1, pool_size)
+        self.keepalive = keepalive
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+
+    def _connect(self):
+        """새 SSH/SFTP 연결 생성"""
+        ssh = paramiko.SSHClient()
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+        # SSH 키 또는 비밀번호로 연결
+        if self.private_key:
+            # SSH 키 파일 경로 처리 (~/ 확장)
+            key_path = os.path.expanduser(self.private_key)
+            ssh.connect(
+                self.host,
+                port=self.port,
+                username=self.username,
+                key_filename=key_path
+            )
+        elif self.password:
+            # 비밀번호로 연결
+            ssh.connect(
+                self.host,
+                port=self.port,
+                username=self.username,
+                password=self.password
+            )
+        else:
+            raise Exception("SSH 키 파일 또는 비밀번호가 필요합니다")
+
+        # 유휴 상태에서도 연결이 끊기지 않도록 keepalive 설정
+        if self.keepalive:
+            ssh.get_transport().set_keepalive(self.keepalive)
+
+        return _PooledConnection(ssh, ssh.open_sftp())
+
+    def _checkout(self):
+        """유휴 연결 중 살아 있는 것을 꺼내고, 없으면 새로 연결"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+
+            if conn.is_alive():
+                return conn
+
+            # 끊긴 연결은 버리고 다음 연결 확인 (자동 재연결)
+            conn.close()
+
+    @contextmanager
+    def connection(self):
+        """풀에서 SFTP 세션을 빌려 사용한 뒤 반납"""
+        self._slots.acquire()
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn.sftp
+        except Exception:
+            # 사용 중 오류가 난 연결은 상태를 알 수 없으므로 폐기
+            if conn is not None:
+                conn.close()
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._idle.put(conn)
+            self._slots.release()
+
+    def close(self):
+        """유휴 연결을 모두 종료 (이후 다시 사용하면 새로 연결)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
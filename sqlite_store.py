@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+SQLite 파일 저장소 공통 부분
+업로드 캐시, 작업 저널, 작업 큐가 함께 쓰는 지연 연결과 스레드 잠금을
+모아 둡니다. 하위 클래스는 SCHEMA에 테이블 정의만 적습니다.
+"""
+
+import sqlite3
+import threading
+
+
+class SQLiteStore:
+    SCHEMA = ''
+
+    def __init__(self, db_file, timeout=5.0, isolation_level=''):
+        """파일 경로와 연결 옵션만 저장하고 연결은 처음 사용할 때 생성
+
+        timeout은 다른 프로세스가 쓰는 중일 때 기다리는 시간(초)이며,
+        isolation_level=None이면 트랜잭션을 직접 관리합니다.
+        """
+        self.db_file = db_file
+        self._timeout = timeout
+        self._isolation_level = isolation_level
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        """SQLite 연결 (여러 스레드가 self._lock으로 공유, 처음 연결할 때 SCHEMA 적용)"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                self.db_file, timeout=self._timeout, isolation_level=self._isolation_level,
+                check_same_thread=False
+            )
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    def close(self):
+        """연결 종료 (이후 다시 사용하면 새로 연결)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
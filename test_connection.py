@@ -138,7 +138,13 @@ def main():
         
         # 각 연결 테스트
         wp_ok = test_wordpress_api(config)
-        sftp_ok = test_sftp_connection(config)
+        if config.get('upload_method', 'sftp') == 'media':
+            # 미디어 라이브러리 업로드는 WordPress API만 사용
+            print("\n=== SFTP 연결 테스트 ===")
+            print("⚠️  upload_method가 media이므로 SFTP 테스트를 건너뜁니다")
+            sftp_ok = True
+        else:
+            sftp_ok = test_sftp_connection(config)
         db_ok = test_database_connection(config)
         
         print(f"\n=== 테스트 결과 요약 ===")
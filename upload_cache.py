@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+이미지 업로드 캐시
+내용 해시(SHA-256)를 기준으로 이미 업로드한 이미지의 원격 경로와 URL을
+SQLite 파일에 기록해, 같은 이미지를 다시 전송하지 않도록 합니다.
+"""
+
+import os
+import hashlib
+from datetime import datetime
+from sqlite_store import SQLiteStore
+
+
+class UploadCache(SQLiteStore):
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS uploads (
+            target TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            remote_path TEXT NOT NULL,
+            image_url TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            uploaded_at TEXT NOT NULL,
+            PRIMARY KEY (target, content_hash)
+        );
+        CREATE TABLE IF NOT EXISTS local_files (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            content_hash TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_file='upload_cache.db'):
+        """캐시 파일 경로 설정 (업로드 워커 스레드들이 연결 하나를 공유)"""
+        super().__init__(db_file)
+
+    def file_hash(self, local_path):
+        """파일 내용 해시 (크기/수정 시각이 같으면 이전 계산값 재사용)"""
+        stat = os.stat(local_path)
+        path = os.path.abspath(local_path)
+
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT content_hash FROM local_files WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (path, stat.st_size, stat.st_mtime_ns)
+            ).fetchone()
+        if row:
+            return row[0]
+
+        sha256 = hashlib.sha256()
+        with open(local_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                sha256.update(block)
+        content_hash = sha256.hexdigest()
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO local_files (path, size, mtime_ns, content_hash) VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, content_hash)
+            )
+            conn.commit()
+        return content_hash
+
+    def lookup(self, target, content_hash):
+        """업로드 기록 조회 (target은 업로드 대상 서버/경로, 없으면 None)"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT remote_path, image_url, size FROM uploads WHERE target = ? AND content_hash = ?",
+                (target, content_hash)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'remote_path': row[0], 'image_url': row[1], 'size': row[2]}
+
+    def record(self, target, content_hash, remote_path, image_url, size):
+        """업로드 완료 기록"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO uploads "
+                "(target, content_hash, remote_path, image_url, size, uploaded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (target, content_hash, remote_path, image_url, size, datetime.now().isoformat())
+            )
+            conn.commit()
+
+    def forget(self, target, content_hash):
+        """원격 파일이 사라진 기록 삭제"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "DELETE FROM uploads WHERE target = ? AND content_hash = ?",
+                (target, content_hash)
+            )
+            conn.commit()
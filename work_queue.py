@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+영구 작업 큐
+SQLite 파일에 포스트 작업을 저장하고, 여러 워커 프로세스가 임대(lease)
+방식으로 하나씩 가져가 처리합니다. 워커가 죽으면 임대 시간이 지난 작업을
+다른 워커가 다시 가져갑니다.
+"""
+
+import json
+import time
+from datetime import datetime
+from sqlite_store import SQLiteStore
+
+
+class WorkQueue(SQLiteStore):
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            queue TEXT NOT NULL,
+            job_key TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            state TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            lease_owner TEXT,
+            lease_expires REAL,
+            result TEXT,
+            updated_at TEXT NOT NULL,
+            UNIQUE (queue, job_key)
+        );
+        CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (queue, state, id);
+    """
+
+    def __init__(self, db_file='work_queue.db', lease_seconds=600, max_attempts=3):
+        """큐 파일 경로와 임대 시간(초), 작업당 최대 시도 횟수 설정
+
+        여러 워커 프로세스가 쓰므로 잠금을 최대 30초 기다리고, 트랜잭션은
+        _write()에서 직접 관리합니다. 여러 호스트가 같은 파일을 쓰려면 파일
+        잠금이 제대로 동작하는 공유 파일 시스템이어야 합니다.
+        """
+        super().__init__(db_file, timeout=30, isolation_level=None)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def _write(self, func):
+        """쓰기 잠금을 먼저 잡는 트랜잭션(BEGIN IMMEDIATE) 안에서 func(conn) 실행"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(conn)
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return result
+
+    def enqueue(self, queue, jobs):
+        """(작업 키, 내용) 목록을 큐에 추가하고 (새 작업 수, 다시 대기시킨 실패 작업 수) 반환
+
+        이미 있는 키는 건너뛰며, 실패로 끝난 작업은 다시 대기 상태로 돌립니다.
+        """
+        now = datetime.now().isoformat()
+
+        def add(conn):
+            added = 0
+            retried = 0
+            for job_key, payload in jobs:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO jobs (queue, job_key, payload, state, updated_at) "
+                    "VALUES (?, ?, ?, 'pending', ?)",
+                    (queue, job_key, json.dumps(payload, ensure_ascii=False), now)
+                )
+                if cursor.rowcount:
+                    added += 1
+                    continue
+                cursor = conn.execute(
+                    "UPDATE jobs SET state = 'pending', attempts = 0, updated_at = ? "
+                    "WHERE queue = ? AND job_key = ? AND state = 'failed'",
+                    (now, queue, job_key)
+                )
+                retried += cursor.rowcount
+            return added, retried
+
+        return self._write(add)
+
+    def claim(self, queue, worker_id):
+        """대기 중이거나 임대 시간이 지난 작업 하나를 임대 (없으면 None)
+
+        반환하는 작업의 expired는 이전 워커가 완료/실패를 기록하지 못하고 임대
+        시간이 지난 작업인지 여부입니다 (이전 시도의 결과를 알 수 없음). 임대
+        시간이 지난 작업이 이미 최대 시도 횟수만큼 임대됐으면 같은 트랜잭션에서
+        실패로 기록하고 다음 작업을 찾습니다.
+        """
+        def take(conn):
+            now = time.time()
+            while True:
+                row = conn.execute(
+                    "SELECT id, job_key, payload, attempts, state FROM jobs WHERE queue = ? "
+                    "AND (state = 'pending' OR (state = 'leased' AND lease_expires < ?)) "
+                    "ORDER BY id LIMIT 1",
+                    (queue, now)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[4] == 'leased' and row[3] >= self.max_attempts:
+                    post = json.loads(row[2])['post']
+                    result = {'post_number': post['number'], 'title': post['title'], 'status': 'error',
+                              'error': f"임대 시간이 {row[3]}번 지나 실패로 처리했습니다"}
+                    conn.execute(
+                        "UPDATE jobs SET state = 'failed', result = ?, lease_owner = NULL, lease_expires = NULL, "
+                        "updated_at = ? WHERE id = ?",
+                        (json.dumps(result, ensure_ascii=False), datetime.now().isoformat(), row[0])
+                    )
+                    continue
+                conn.execute(
+                    "UPDATE jobs SET state = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                    "lease_expires = ?, updated_at = ? WHERE id = ?",
+                    (worker_id, now + self.lease_seconds, datetime.now().isoformat(), row[0])
+                )
+                return {'id': row[0], 'key': row[1], 'payload': json.loads(row[2]), 'attempts': row[3] + 1,
+                        'expired': row[4] == 'leased'}
+
+        return self._write(take)
+
+    def extend(self, job_id, worker_id):
+        """처리 중인 작업의 임대 연장 (임대를 잃었으면 False)"""
+        def renew(conn):
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (time.time() + self.lease_seconds, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+        return self._write(renew)
+
+    def complete(self, job_id, worker_id, result):
+        """작업 완료 기록 (임대를 잃었으면 False)"""
+        return self._finish(job_id, worker_id, 'done', result)
+
+    def fail(self, job, worker_id, result):
+        """작업 실패 기록 (최대 시도 횟수 전이면 다시 대기 상태로)"""
+        state = 'failed' if job['attempts'] >= self.max_attempts else 'pending'
+        return self._finish(job['id'], worker_id, state, result)
+
+    def _finish(self, job_id, worker_id, state, result):
+        """임대한 워커만 작업 상태를 바꿀 수 있음"""
+        def update(conn):
+            cursor = conn.execute(
+                "UPDATE jobs SET state = ?, result = ?, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (state, json.dumps(result, ensure_ascii=False), datetime.now().isoformat(), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+        return self._write(update)
+
+    def counts(self, queue):
+        """상태별 작업 수"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT state, COUNT(*) FROM jobs WHERE queue = ? GROUP BY state", (queue,)
+            ).fetchall()
+        return dict(rows)
+
+    def results(self, queue):
+        """끝난 작업들의 결과 (큐에 넣은 순서)"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT result FROM jobs WHERE queue = ? AND state IN ('done', 'failed') ORDER BY id",
+                (queue,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows if row[0]]
@@ -7,19 +7,47 @@ TXT 파일과 이미지를 이용해 WordPress 블로그에 자동으로 포스
 import os
 import re
 import json
+import itertools
+import time
+import socket
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 import paramiko
 from datetime import datetime, timedelta
-import mysql.connector
 from urllib.parse import urljoin
 import base64
 import mimetypes
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sftp_pool import SFTPConnectionPool
+from post_index import PostIndex
+from upload_cache import UploadCache
+from job_journal import JobJournal
+from db_pool import DatabasePool
+from wp_utils import SOURCE_META_KEY, AUTO_POST_TAG_SLUG
+from rate_limiter import AdaptiveRateLimiter, DEFAULT_RATE_LIMITS, parse_retry_after
+from retry_policy import RetryPolicy
+from image_optimizer import ImageOptimizer
+
+# WordPress 배치 API가 한 번에 받는 최대 하위 요청 수
+REST_BATCH_LIMIT = 25
+
+# 다시 시도할 REST 응답 코드 (504는 서버가 처리했을 수 있어 중복 확인 후 재시도)
+RETRYABLE_STATUS_CODES = (429, 502, 503)
+AMBIGUOUS_STATUS_CODES = (504,)
+
+# 이미지 파일명 패턴: [번호]-[순서].jpg 또는 [번호]-[순서].png
+IMAGE_FILE_PATTERN = re.compile(r'^(0|[1-9]\d*)-(\d+)\.(jpg|jpeg|png|gif)$', re.IGNORECASE)
 
 class WordPressAutoPoster:
-    def __init__(self, config_file='wp_config.json'):
-        """설정 파일을 로드하여 초기화"""
-        with open(config_file, 'r', encoding='utf-8') as f:
-            self.config = json.load(f)
+    def __init__(self, config_file='wp_config.json', upload_workers=None, upload_method=None, config=None):
+        """설정 파일을 로드하여 초기화 (config가 주어지면 파일 대신 사용)"""
+        if config is None:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        self.config = config
         
         self.wp_url = self.config['wordpress']['url']
         self.wp_user = self.config['wordpress']['username']
@@ -29,120 +57,454 @@ class WordPressAutoPoster:
         if 'application_password' in self.config['wordpress']:
             self.wp_application_password = self.config['wordpress']['application_password']
         
-        # SFTP 설정
-        self.sftp_host = self.config['sftp']['host']
-        self.sftp_user = self.config['sftp']['username']
-        self.sftp_password = self.config['sftp'].get('password')
-        self.sftp_private_key = self.config['sftp'].get('privateKey')
-        self.sftp_port = self.config['sftp'].get('port', 22)
-        self.remote_image_path = self.config['sftp']['remote_image_path']
-        self.image_url_base = self.config['sftp']['image_url_base']
+        # REST API 타임아웃 (초): 숫자 하나 또는 [연결, 읽기]
+        timeout = self.config['wordpress'].get('timeout', [10, 60])
+        self.http_timeout = tuple(timeout) if isinstance(timeout, list) else timeout
+        
+        # REST API 세션 (keep-alive로 연결 재사용, 인증 헤더는 한 번만 계산)
+        self.session = self._create_http_session()
+        self.rest_batch_supported = True
+        
+        # 엔드포인트(rest/sftp)별 적응형 속도 제한 (rate_limits 설정이 있을 때만)
+        self.rate_limiters = self.create_rate_limiters(self.config.get('rate_limits') or {})
+        
+        # 일시적인 REST/SFTP 오류 재시도 (지수 백오프 + 지터, 실행 전체 예산)
+        self.retry_policy = RetryPolicy(**self.config.get('retry', {}))
+        
+        # 이미지 업로드 방식: sftp(원격 폴더에 직접 저장) 또는 media(WordPress 미디어 라이브러리)
+        self.upload_method = upload_method or self.config.get('upload_method', 'sftp')
+        if self.upload_method not in ('sftp', 'media'):
+            raise ValueError(f"지원하지 않는 업로드 방식입니다: {self.upload_method}")
+        
+        # SFTP 설정 (media 방식이면 없어도 됨)
+        sftp_config = self.config.get('sftp', {})
+        if self.upload_method == 'sftp':
+            missing = [key for key in ('host', 'username', 'remote_image_path', 'image_url_base')
+                       if key not in sftp_config]
+            if missing:
+                raise ValueError(f"sftp 설정에 {', '.join(missing)} 항목이 필요합니다")
+        self.sftp_host = sftp_config.get('host')
+        self.sftp_user = sftp_config.get('username')
+        self.sftp_password = sftp_config.get('password')
+        self.sftp_private_key = sftp_config.get('privateKey')
+        self.sftp_port = sftp_config.get('port', 22)
+        self.remote_image_path = sftp_config.get('remote_image_path')
+        self.image_url_base = sftp_config.get('image_url_base')
+        
+        # 이미지 동시 업로드 워커 수 (인자 > 설정 파일 > 기본값)
+        if upload_workers is None:
+            upload_workers = sftp_config.get('upload_workers', 4)
+        self.upload_workers = max(1, upload_workers)
+        
+        # SFTP 연결 풀 (실행 전체에서 세션 재사용, 워커마다 세션 1개)
+        self.sftp_pool = self._create_sftp_pool(self.upload_workers)
+        self._remote_dirs = set()
+        
+        # 내용 해시 기반 업로드 캐시 (null이면 사용 안 함)
+        upload_cache_file = sftp_config.get('upload_cache', 'upload_cache.db')
+        self.upload_cache = UploadCache(upload_cache_file) if upload_cache_file else None
+        if self.upload_method == 'media':
+            self.upload_cache_target = f"media:{self.wp_url}"
+        else:
+            self.upload_cache_target = f"{self.sftp_user}@{self.sftp_host}:{self.remote_image_path}"
+        self.verify_cached_uploads = sftp_config.get('verify_cached_uploads', True)
+        
+        # 업로드 전 이미지 최적화 (크기 축소, EXIF 제거, 재압축, srcset 변형)
+        optimization = dict(self.config.get('image_optimization', {}))
+        if optimization.pop('enabled', False):
+            file_hash = self.upload_cache.file_hash if self.upload_cache is not None else None
+            self.image_optimizer = ImageOptimizer(file_hash=file_hash, **optimization)
+        else:
+            self.image_optimizer = None
+        
+        # 포스트별 진행 상태를 기록하는 작업 저널 (null이면 사용 안 함)
+        journal_file = self.config.get('journal', 'job_journal.db')
+        self.journal = JobJournal(journal_file) if journal_file else None
+        
+        # 같은 제목의 포스트가 이미 있으면 생성하지 않음 (REST API 검색, 제목 키로 비교)
+        self.skip_duplicates = self.config.get('skip_duplicates', False)
+        self._existing_titles = set()   # 사이트에 있거나 이번 실행에서 만든 제목
+        self._checked_titles = set()    # 사이트 검색을 마친 제목
+        self._claimed_titles = set()    # 지금 생성 중인 제목
+        self._titles_lock = threading.Lock()
+        
+        # 생성한 포스트에 자동 포스팅 태그 표시 (REST API, wp_utils.py 정리 기능이 이 표시로 찾음)
+        self.tag_posts = self.config.get('tag_posts', True)
+        self._auto_post_tag_id = None
+        self._tag_lock = threading.Lock()
+        
+        # 원본 파일/번호 메타도 기록 (--clean --source용, 데이터베이스 접근 필요)
+        self.tag_source_meta = self.config.get('tag_source_meta', False)
+        self.source_file = None
         
-        # MySQL 설정
+        # 이미지 폴더 인덱스 캐시 (폴더 → (수정 시각, 번호별 이미지 목록))
+        self._image_indexes = {}
+        
+        # 범위 지정 실행 시 post.txt 오프셋 인덱스 사용 여부
+        self.use_post_index = self.config.get('use_post_index', True)
+        
+        # MySQL 설정 (같은 설정을 쓰는 WordPressUtils와 연결 풀 공유)
         self.db_config = self.config['database']
+        self.db_pool = DatabasePool.for_config(self.db_config)
+        
+    def _create_http_session(self):
+        """인증 헤더와 연결 풀이 설정된 requests 세션 생성"""
+        # 인증 헤더 (Application Password 사용)
+        if hasattr(self, 'wp_application_password'):
+            print("Application Password 사용")
+            credentials = base64.b64encode(f"{self.wp_user}:{self.wp_application_password}".encode()).decode()
+        else:
+            print("일반 비밀번호 사용")
+            credentials = base64.b64encode(f"{self.wp_user}:{self.wp_password}".encode()).decode()
+        
+        session = requests.Session()
+        session.headers.update({
+            'Authorization': f'Basic {credentials}',
+            'Connection': 'keep-alive'
+        })
+        
+        # 동시 REST 요청 수만큼 연결을 유지하도록 풀 크기 조정
+        pool_maxsize = self.config['wordpress'].get('pool_maxsize', 10)
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def create_rate_limiters(self, limits):
+        """엔드포인트별 속도 제한 생성 (설정값이 없는 항목은 기본값 사용)"""
+        return {
+            kind: AdaptiveRateLimiter(kind, **dict(DEFAULT_RATE_LIMITS.get(kind, {}), **settings))
+            for kind, settings in limits.items()
+        }
+    
+    def _rate_acquire(self, kind):
+        """속도 제한 차례까지 대기 (속도 제한이 없으면 바로 반환)"""
+        limiter = self.rate_limiters.get(kind)
+        if limiter is not None:
+            limiter.acquire()
+    
+    def _rate_record(self, kind, started, response=None, success=True, units=1):
+        """요청 결과를 속도 제한에 반영 (지연은 units당 시간으로 환산)"""
+        limiter = self.rate_limiters.get(kind)
+        if limiter is None:
+            return
         
+        retry_after = None
+        if response is not None:
+            success = response.status_code != 429 and response.status_code < 500
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        limiter.record(success, (time.monotonic() - started) / max(1, units), retry_after)
+    
+    def _rest_post(self, api_url, data, units=1):
+        """속도 제한을 지키며 REST API에 POST"""
+        self._rate_acquire('rest')
+        started = time.monotonic()
+        try:
+            response = self.session.post(api_url, json=data, timeout=self.http_timeout)
+        except requests.exceptions.RequestException:
+            self._rate_record('rest', started, success=False)
+            raise
+        self._rate_record('rest', started, response, units=units)
+        return response
+    
+    def _rest_post_retrying(self, api_url, data, titles, units=1):
+        """일시적인 오류면 다시 시도하며 REST API에 POST
+        
+        연결 타임아웃/새 연결 실패와 429/502/503은 바로 재시도합니다. 읽기
+        타임아웃, 연결 끊김, 504는 서버가 포스트를 이미 만들었을 수 있으므로,
+        같은 제목의 포스트가 없다고 확인됐을 때만 재시도합니다 (확인할 수
+        없으면 재시도 안 함).
+        """
+        def retry_on(error):
+            if self._is_unsent_error(error):
+                return True
+            if self._may_have_reached_server(error):
+                return self._posts_exist(titles) is False
+            return False
+        
+        def retry_result(response):
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                return parse_retry_after(response.headers.get('Retry-After')) or 0
+            if response.status_code in AMBIGUOUS_STATUS_CODES and self._posts_exist(titles) is False:
+                return 0
+            return None
+        
+        return self.retry_policy.call(
+            lambda: self._rest_post(api_url, data, units),
+            retry_on=retry_on, retry_result=retry_result, label='REST'
+        )
+    
+    @staticmethod
+    def _is_unsent_error(error):
+        """요청이 서버에 닿기 전에 실패한 오류인지 (연결 타임아웃, 새 연결 실패)"""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+            return False
+        return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+    
+    def _may_have_reached_server(self, error):
+        """서버가 요청을 처리했을 수 있는 오류인지 (읽기 타임아웃, 연결 끊김, 504)"""
+        if isinstance(error, requests.exceptions.HTTPError):
+            return error.response is not None and error.response.status_code in AMBIGUOUS_STATUS_CODES
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return not self._is_unsent_error(error)
+        return False
+    
+    def _posts_exist(self, titles):
+        """같은 제목의 포스트가 하나라도 있는지 REST API 검색으로 확인 (확인할 수 없으면 None)"""
+        found = self.find_posts_by_title(titles)
+        if found is None:
+            print("  기존 포스트를 확인할 수 없어 재시도하지 않습니다")
+            return None
+        return bool(found)
+    
+    @staticmethod
+    def _title_key(title):
+        """제목 비교 키 (MySQL 기본 콜레이션처럼 대소문자와 앞뒤 공백 무시)"""
+        return title.strip().casefold()
+    
+    def find_posts_by_title(self, titles, max_pages=10):
+        """REST API 검색으로 같은 제목의 포스트를 찾아 {제목 키: 포스트 ID} 반환 (확인할 수 없으면 None)
+        
+        검색은 부분 일치라 편집 컨텍스트의 원본 제목과 제목 키로 비교하며,
+        결과가 여러 페이지면 max_pages까지 넘겨 봅니다. 그보다 많으면 확인할
+        수 없는 것으로 봅니다.
+        """
+        found = {}
+        for title in titles:
+            key = self._title_key(title)
+            page = 1
+            while True:
+                self._rate_acquire('rest')
+                started = time.monotonic()
+                try:
+                    response = self.session.get(
+                        f"{self.wp_url}/wp-json/wp/v2/posts",
+                        params={'search': title, 'status': 'any', 'context': 'edit',
+                                'per_page': 100, 'page': page, '_fields': 'id,title'},
+                        timeout=self.http_timeout
+                    )
+                    self._rate_record('rest', started, response)
+                    response.raise_for_status()
+                    for post in response.json():
+                        if self._title_key(post['title']['raw']) == key:
+                            found.setdefault(key, post['id'])
+                    total_pages = int(response.headers.get('X-WP-TotalPages', 1))
+                except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as e:
+                    print(f"  기존 포스트 확인 실패: {e}")
+                    return None
+                if key in found or page >= total_pages:
+                    break
+                if page >= max_pages:
+                    print(f"  기존 포스트 확인 실패: 검색 결과가 너무 많습니다 ({title})")
+                    return None
+                page += 1
+        return found
+    
+    def site_has_title(self, title):
+        """같은 제목의 포스트가 사이트에 있거나 이번 실행에서 만들어졌는지
+        
+        사이트 검색은 제목마다 한 번만 하고, 검색에 실패하면 없는 것으로 봅니다.
+        """
+        key = self._title_key(title)
+        with self._titles_lock:
+            if key in self._existing_titles:
+                return True
+            if key in self._checked_titles:
+                return False
+        found = self.find_posts_by_title([title])
+        if found is None:
+            return False
+        with self._titles_lock:
+            self._checked_titles.add(key)
+            if found:
+                self._existing_titles.add(key)
+            return key in self._existing_titles
+    
+    def _is_duplicate(self, post):
+        """skip_duplicates일 때 이미 있는 제목인지 (이미지 업로드 전 확인용, 제목을 선점하지 않음)"""
+        return self.skip_duplicates and self.site_has_title(post['title'])
+    
+    def _claim_title(self, post):
+        """포스트를 만들기 직전에 제목 선점 (이미 있거나 먼저 선점한 포스트가 있으면 False)
+        
+        파이프라인/배치/비동기 실행은 포스트를 미리 읽어 두므로, 중복 여부는
+        읽을 때가 아니라 생성 직전에 이 함수로 정합니다.
+        """
+        if not self.skip_duplicates:
+            return True
+        if self.site_has_title(post['title']):
+            return False
+        key = self._title_key(post['title'])
+        with self._titles_lock:
+            if key in self._existing_titles or key in self._claimed_titles:
+                return False
+            self._claimed_titles.add(key)
+            return True
+    
+    def _release_title(self, post, created):
+        """선점한 제목 반납 (만들었으면 이미 있는 제목으로 기록)"""
+        key = self._title_key(post['title'])
+        with self._titles_lock:
+            self._claimed_titles.discard(key)
+            if created:
+                self._existing_titles.add(key)
+    
+    @staticmethod
+    def _is_retryable_sftp_error(error):
+        """연결이 끊기거나 시간이 초과된 SFTP 오류인지 (인증/호스트 키/권한/경로 오류는 재시도 안 함)"""
+        if isinstance(error, (paramiko.AuthenticationException, paramiko.BadHostKeyException)):
+            return False
+        return isinstance(error, (paramiko.SSHException, EOFError, socket.timeout,
+                                  ConnectionError, TimeoutError))
+    
+    def _create_sftp_pool(self, min_size):
+        """SFTP 연결 풀 생성 (동시 사용 수보다 작지 않게, media 방식이면 None)"""
+        if self.upload_method != 'sftp':
+            return None
+        return SFTPConnectionPool(
+            self.sftp_host,
+            self.sftp_user,
+            port=self.sftp_port,
+            password=self.sftp_password,
+            private_key=self.sftp_private_key,
+            pool_size=max(self.config['sftp'].get('pool_size', 4), min_size),
+            keepalive=self.config['sftp'].get('keepalive', 30)
+        )
+    
     def parse_posts_from_txt(self, txt_file):
         """TXT 파일에서 포스트들을 파싱"""
-        with open(txt_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        return list(self.iter_posts_from_txt(txt_file))
+    
+    def iter_posts_from_txt(self, txt_file, start_post=None, end_post=None):
+        """TXT 파일을 한 줄씩 읽으며 포스트를 하나씩 생성 (제너레이터)
         
-        # 포스트를 구분하는 패턴 (-----로 구분)
-        posts = re.split(r'-----\n', content)
-        parsed_posts = []
+        파일 전체를 메모리에 올리지 않으므로 큰 파일도 포스트 하나 크기의
+        메모리로 처리합니다. 범위는 읽는 중에 포스트마다 적용되므로, 번호가
+        정렬되지 않은 파일에서도 인덱스를 쓸 때와 같은 포스트를 반환합니다.
         
-        for post in posts:
-            post = post.strip()
-            if not post:
-                continue
-                
-            # 첫 번째 줄에서 번호와 제목 추출
-            lines = post.split('\n')
-            if not lines:
-                continue
-                
-            first_line = lines[0].strip()
-            # "1. 제목" 형식에서 번호와 제목 추출
-            match = re.match(r'^(\d+)\.\s*(.+)', first_line)
-            if match:
-                post_number = int(match.group(1))
-                title = match.group(2)
-                content_lines = lines[1:] if len(lines) > 1 else []
-                content = '\n'.join(content_lines).strip()
-                
-                parsed_posts.append({
-                    'number': post_number,
-                    'title': title,
-                    'content': content
-                })
+        범위가 주어지면 파일 옆의 오프셋 인덱스(<txt_file>.idx)를 사용해
+        해당 포스트만 바로 읽습니다. 인덱스는 파일 크기나 수정 시각이
+        바뀌면 자동으로 다시 만들어집니다.
+        """
+        if self.use_post_index and (start_post is not None or end_post is not None):
+            index = PostIndex(txt_file, self._parse_post_chunk)
+            for chunk in index.iter_chunks(start_post, end_post):
+                post = self._parse_post_chunk(chunk)
+                if post is not None:
+                    yield post
+            return
         
-        return parsed_posts
+        with open(txt_file, 'r', encoding='utf-8') as f:
+            for chunk in self._iter_post_chunks(f):
+                post = self._parse_post_chunk(chunk)
+                if post is None:
+                    continue
+                if start_post is not None and post['number'] < start_post:
+                    continue
+                if end_post is not None and post['number'] > end_post:
+                    continue
+                yield post
+    
+    def _iter_post_chunks(self, lines):
+        """줄 단위 입력을 구분선(-----) 사이의 텍스트 덩어리로 나눔"""
+        chunk = []
+        for line in lines:
+            # 포스트를 구분하는 패턴 (-----로 구분)
+            if line.endswith('-----\n'):
+                chunk.append(line[:-len('-----\n')])
+                yield ''.join(chunk)
+                chunk = []
+            else:
+                chunk.append(line)
+        yield ''.join(chunk)
+    
+    def _parse_post_chunk(self, post):
+        """구분선 사이의 텍스트 하나를 포스트 딕셔너리로 변환"""
+        post = post.strip()
+        if not post:
+            return None
+        
+        # 첫 번째 줄에서 번호와 제목 추출
+        lines = post.split('\n')
+        first_line = lines[0].strip()
+        # "1. 제목" 형식에서 번호와 제목 추출
+        match = re.match(r'^(\d+)\.\s*(.+)', first_line)
+        if not match:
+            return None
+        
+        content_lines = lines[1:] if len(lines) > 1 else []
+        return {
+            'number': int(match.group(1)),
+            'title': match.group(2),
+            'content': '\n'.join(content_lines).strip()
+        }
     
     def get_post_images(self, post_number, img_folder='img'):
         """특정 포스트 번호에 해당하는 이미지 파일들을 찾기"""
-        images = []
         if not os.path.exists(img_folder):
-            return images
-            
-        for filename in os.listdir(img_folder):
-            # 파일명 패턴: [번호]-[순서].jpg 또는 [번호]-[순서].png
-            pattern = rf'^{post_number}-\d+\.(jpg|jpeg|png|gif)$'
-            if re.match(pattern, filename, re.IGNORECASE):
-                images.append(os.path.join(img_folder, filename))
+            return []
+        
+        return list(self._get_image_index(img_folder).get(post_number, []))
+    
+    def _get_image_index(self, img_folder):
+        """이미지 폴더를 한 번 훑어 포스트 번호 → 정렬된 이미지 목록 인덱스 생성
+        
+        인덱스는 실행 동안 캐시되며, 폴더 수정 시각이 바뀌면(파일 추가/삭제)
+        다시 만들어집니다.
+        """
+        mtime = os.stat(img_folder).st_mtime_ns
+        cached = self._image_indexes.get(img_folder)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        index = {}
+        with os.scandir(img_folder) as entries:
+            for entry in entries:
+                match = IMAGE_FILE_PATTERN.match(entry.name)
+                if match:
+                    post_number, order = int(match.group(1)), int(match.group(2))
+                    index.setdefault(post_number, []).append((order, entry.path))
         
         # 순서대로 정렬
-        images.sort(key=lambda x: int(re.search(rf'{post_number}-(\d+)', os.path.basename(x)).group(1)))
-        return images
+        for post_number, images in index.items():
+            images.sort(key=lambda image: image[0])
+            index[post_number] = [path for _, path in images]
+        
+        self._image_indexes[img_folder] = (mtime, index)
+        return index
     
-    def upload_image_via_sftp(self, local_image_path, post_number):
-        """SFTP를 통해 이미지 업로드"""
+    def upload_image_via_sftp(self, local_image_path, post_number, remote_filename=None):
+        """SFTP를 통해 이미지 업로드 (remote_filename이 없으면 로컬 파일명 사용)"""
         try:
-            # SSH 클라이언트 생성
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            # SSH 키 또는 비밀번호로 연결
-            if self.sftp_private_key:
-                # SSH 키 파일 경로 처리 (~/ 확장)
-                key_path = os.path.expanduser(self.sftp_private_key)
-                ssh.connect(
-                    self.sftp_host, 
-                    port=self.sftp_port,
-                    username=self.sftp_user, 
-                    key_filename=key_path
-                )
-            elif self.sftp_password:
-                # 비밀번호로 연결
-                ssh.connect(
-                    self.sftp_host, 
-                    port=self.sftp_port,
-                    username=self.sftp_user, 
-                    password=self.sftp_password
-                )
-            else:
-                raise Exception("SSH 키 파일 또는 비밀번호가 필요합니다")
-            
-            # SFTP 클라이언트 생성
-            sftp = ssh.open_sftp()
-            
-            # 원격 디렉토리 생성 (존재하지 않는 경우)
+            # 원격 디렉토리 경로와 파일명 생성
             remote_dir = f"{self.remote_image_path}/post_{post_number}"
-            try:
-                sftp.mkdir(remote_dir)
-            except:
-                pass  # 이미 존재하는 경우 무시
-            
-            # 파일명 생성
-            filename = os.path.basename(local_image_path)
+            filename = remote_filename or os.path.basename(local_image_path)
             remote_file_path = f"{remote_dir}/{filename}"
             
-            # 파일 업로드
-            sftp.put(local_image_path, remote_file_path)
+            # 같은 내용의 이미지가 이미 업로드되어 있으면 전송 생략
+            content_hash = None
+            if self.upload_cache is not None:
+                content_hash = self.upload_cache.file_hash(local_image_path)
+                cached_url = self._find_cached_upload(content_hash, local_image_path)
+                if cached_url:
+                    return cached_url
+            
+            # 연결이 끊기면 풀이 연결을 버리므로 재시도는 새 연결로 진행
+            self.retry_policy.call(
+                lambda: self._put_image(local_image_path, remote_dir, remote_file_path),
+                retry_on=self._is_retryable_sftp_error, label='SFTP'
+            )
             
             # 웹 URL 생성
             image_url = f"{self.image_url_base}/post_{post_number}/{filename}"
             
-            sftp.close()
-            ssh.close()
+            if content_hash is not None:
+                self.upload_cache.record(
+                    self.upload_cache_target, content_hash, remote_file_path,
+                    image_url, os.path.getsize(local_image_path)
+                )
             
             return image_url
             
@@ -150,14 +512,236 @@ class WordPressAutoPoster:
             print(f"이미지 업로드 실패: {local_image_path}, 오류: {e}")
             return None
     
-    def create_wp_post(self, title, content, post_number, images=None, status='draft'):
-        """WordPress REST API를 통해 포스트 생성"""
+    def upload_image(self, local_image_path, post_number, remote_filename=None):
+        """설정된 업로드 방식(sftp/media)으로 이미지 하나 업로드"""
+        if self.upload_method == 'media':
+            return self.upload_image_via_media(local_image_path, remote_filename)
+        return self.upload_image_via_sftp(local_image_path, post_number, remote_filename)
+    
+    def upload_image_via_media(self, local_image_path, remote_filename=None):
+        """WordPress 미디어 라이브러리(/wp-json/wp/v2/media)에 이미지 업로드
+        
+        WordPress가 첨부파일과 썸네일을 만들며, 반환값은 {'src': URL,
+        'id': 첨부파일 ID}입니다 (실패하면 None). 파일은 메모리에 올리지 않고
+        디스크에서 읽으며 전송합니다.
+        """
+        filename = remote_filename or os.path.basename(local_image_path)
+        try:
+            content_hash = None
+            if self.upload_cache is not None:
+                content_hash = self.upload_cache.file_hash(local_image_path)
+                cached = self.upload_cache.lookup(self.upload_cache_target, content_hash)
+                if cached is not None:
+                    if not self.verify_cached_uploads or self._media_exists(cached['remote_path']):
+                        return {'src': cached['image_url'], 'id': int(cached['remote_path'])}
+                    self.upload_cache.forget(self.upload_cache_target, content_hash)
+            
+            def retry_result(response):
+                if response.status_code in RETRYABLE_STATUS_CODES + AMBIGUOUS_STATUS_CODES:
+                    return parse_retry_after(response.headers.get('Retry-After')) or 0
+                return None
+            
+            response = self.retry_policy.call(
+                lambda: self._post_media(local_image_path, filename),
+                retry_on=lambda error: isinstance(error, (requests.exceptions.ConnectionError,
+                                                          requests.exceptions.Timeout)),
+                retry_result=retry_result, label='미디어'
+            )
+            
+            if response.status_code >= 400:
+                print(f"오류 응답: {response.status_code}")
+                print(f"응답 내용: {response.text[:200]}")
+            response.raise_for_status()
+            media = response.json()
+            
+            if content_hash is not None:
+                self.upload_cache.record(
+                    self.upload_cache_target, content_hash, str(media['id']),
+                    media['source_url'], os.path.getsize(local_image_path)
+                )
+            return {'src': media['source_url'], 'id': media['id']}
+            
+        except (requests.exceptions.RequestException, OSError, ValueError, KeyError) as e:
+            print(f"미디어 업로드 실패: {local_image_path}, 오류: {e}")
+            return None
+    
+    def _post_media(self, local_image_path, filename):
+        """미디어 요청 한 번 전송 (재시도마다 파일을 처음부터 다시 읽음)"""
+        api_url = f"{self.wp_url}/wp-json/wp/v2/media"
+        headers = {
+            'Content-Type': mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+            'Content-Disposition': f'attachment; filename="{filename}"'
+        }
+        size_mb = os.path.getsize(local_image_path) / (1024 * 1024)
+        
+        self._rate_acquire('media')
+        started = time.monotonic()
+        with open(local_image_path, 'rb') as f:
+            try:
+                # 파일 객체를 넘기면 requests가 블록 단위로 읽어 전송
+                response = self.session.post(api_url, data=f, headers=headers, timeout=self.http_timeout)
+            except requests.exceptions.RequestException:
+                self._rate_record('media', started, success=False)
+                raise
+        self._rate_record('media', started, response, units=size_mb)
+        return response
+    
+    def _media_exists(self, attachment_id):
+        """캐시에 기록된 첨부파일이 아직 미디어 라이브러리에 있는지 확인"""
+        try:
+            response = self.session.get(
+                f"{self.wp_url}/wp-json/wp/v2/media/{attachment_id}",
+                params={'_fields': 'id'}, timeout=self.http_timeout
+            )
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+    
+    def _put_image(self, local_image_path, remote_dir, remote_file_path):
+        """풀에서 SFTP 연결을 빌려 파일 하나 전송"""
+        self._rate_acquire('sftp')
+        with self.sftp_pool.connection() as sftp:
+            # 원격 디렉토리 생성 (실행 중 한 번만 시도)
+            if remote_dir not in self._remote_dirs:
+                try:
+                    sftp.mkdir(remote_dir)
+                except:
+                    pass  # 이미 존재하는 경우 무시
+                self._remote_dirs.add(remote_dir)
+            
+            # 파일 업로드 (지연은 MB당 시간으로 속도 제한에 반영)
+            started = time.monotonic()
+            try:
+                sftp.put(local_image_path, remote_file_path)
+            except Exception:
+                self._rate_record('sftp', started, success=False)
+                raise
+            self._rate_record('sftp', started, units=os.path.getsize(local_image_path) / (1024 * 1024))
+    
+    def _find_cached_upload(self, content_hash, local_image_path):
+        """업로드 캐시에서 URL 찾기 (원격 파일 크기까지 확인)"""
+        cached = self.upload_cache.lookup(self.upload_cache_target, content_hash)
+        if cached is None:
+            return None
+        
+        if self.verify_cached_uploads:
+            with self.sftp_pool.connection() as sftp:
+                try:
+                    remote_size = sftp.stat(cached['remote_path']).st_size
+                except IOError:
+                    remote_size = None
+            
+            # 원격 파일이 없거나 달라졌으면 다시 업로드
+            if remote_size != cached['size']:
+                self.upload_cache.forget(self.upload_cache_target, content_hash)
+                return None
+        
+        print(f"  이미 업로드된 이미지 재사용: {local_image_path}")
+        return cached['image_url']
+    
+    def upload_post_images(self, local_images, post_number, log_prefix='  '):
+        """포스트의 이미지들을 워커 풀로 동시에 업로드
+        
+        업로드가 끝나는 순서와 관계없이 반환되는 이미지 목록은
+        get_post_images가 정렬한 순서(N-1, N-2, ...)를 유지합니다.
+        """
+        if not local_images:
+            return []
+        
+        for img_path in local_images:
+            print(f"{log_prefix}이미지 업로드 중: {img_path}")
+        
+        plan = self.image_upload_plan(local_images)
+        uploads = [upload for group in plan for upload in group]
+        
+        workers = min(self.upload_workers, len(uploads))
+        if workers == 1:
+            image_urls = [self.upload_image(path, post_number, name) for path, name, _ in uploads]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                image_urls = list(executor.map(
+                    lambda upload: self.upload_image(upload[0], post_number, upload[1]),
+                    uploads
+                ))
+        
+        return self.group_uploaded_images(plan, image_urls)
+    
+    def image_upload_plan(self, local_images):
+        """이미지마다 업로드할 [(로컬 파일, 원격 파일명, 너비), ...] 목록
+        
+        최적화를 사용하면 최적화된 파일과 srcset 변형들(큰 것부터)이고,
+        아니면 원본 파일 하나입니다. media 방식은 WordPress가 크기별 변형을
+        만들므로 최적화된 파일 하나만 올립니다.
+        """
+        if self.image_optimizer is None:
+            return [[(path, None, None)] for path in local_images]
+        
+        plan = []
+        for path, variants in zip(local_images, self.image_optimizer.optimize(local_images)):
+            if not variants:
+                plan.append([(path, None, None)])
+                continue
+            stem = os.path.splitext(os.path.basename(path))[0]
+            if self.upload_method == 'media':
+                variant_path = variants[0][0]
+                plan.append([(variant_path, stem + os.path.splitext(variant_path)[1], None)])
+                continue
+            plan.append([
+                (variant_path, f"{stem}-{width}w{os.path.splitext(variant_path)[1]}", width)
+                for variant_path, width in variants
+            ])
+        return plan
+    
+    @staticmethod
+    def group_uploaded_images(plan, image_urls):
+        """업로드 URL을 이미지별 항목으로 묶음
+        
+        변형이 없는 이미지는 업로드 결과 그대로(URL 문자열 또는 media 방식의
+        {'src', 'id'}), 변형이 있으면 {'src', 'srcset'} 딕셔너리입니다.
+        가장 큰 파일이 실패한 이미지는 제외합니다.
+        """
+        images = []
+        position = 0
+        for group in plan:
+            urls = image_urls[position:position + len(group)]
+            position += len(group)
+            if not urls[0]:
+                continue
+            if group[0][2] is None:
+                images.append(urls[0])
+            else:
+                images.append({
+                    'src': urls[0],
+                    'srcset': [[url, width] for url, (_, _, width) in zip(urls, group) if url]
+                })
+        return images
+    
+    def _build_post_data(self, title, content, post_number, images=None, status='draft'):
+        """REST API로 보낼 포스트 데이터 생성"""
         
         # 이미지가 있는 경우 컨텐츠에 추가
         if images:
             image_html = ""
-            for img_url in images:
-                image_html += f'<img src="{img_url}" alt="{title}" style="max-width: 100%; height: auto; margin: 10px 0;" />\n'
+            for image in images:
+                if isinstance(image, dict) and 'id' in image:
+                    # 미디어 라이브러리 이미지: 블록 에디터 이미지 블록 (srcset은 WordPress가 추가)
+                    image_html += (
+                        f'<!-- wp:image {{"id":{image["id"]},"sizeSlug":"large"}} -->\n'
+                        f'<figure class="wp-block-image size-large"><img src="{image["src"]}" alt="{title}" '
+                        f'class="wp-image-{image["id"]}"/></figure>\n'
+                        f'<!-- /wp:image -->\n'
+                    )
+                elif isinstance(image, dict):
+                    # 최적화된 이미지: 화면 너비에 맞는 변형을 브라우저가 고름
+                    srcset = ', '.join(f"{url} {width}w" for url, width in image['srcset'])
+                    max_width = image['srcset'][0][1]
+                    image_html += (
+                        f'<img src="{image["src"]}" srcset="{srcset}" '
+                        f'sizes="(max-width: {max_width}px) 100vw, {max_width}px" alt="{title}" '
+                        f'style="max-width: 100%; height: auto; margin: 10px 0;" />\n'
+                    )
+                else:
+                    image_html += f'<img src="{image}" alt="{title}" style="max-width: 100%; height: auto; margin: 10px 0;" />\n'
             content = image_html + "\n" + content
         
         # 포스트 날짜 계산 (1번이 최신, 번호가 클수록 과거)
@@ -166,22 +750,6 @@ class WordPressAutoPoster:
         post_date = datetime.now() - timedelta(days=days_ago)
         post_date_str = post_date.strftime('%Y-%m-%dT%H:%M:%S')
         
-        # WordPress REST API 엔드포인트
-        api_url = f"{self.wp_url}/wp-json/wp/v2/posts"
-        
-        # 인증 헤더 (Application Password 사용)
-        if hasattr(self, 'wp_application_password'):
-            print("Application Password 사용")
-            credentials = base64.b64encode(f"{self.wp_user}:{self.wp_application_password}".encode()).decode()
-        else:
-            print("일반 비밀번호 사용")
-            credentials = base64.b64encode(f"{self.wp_user}:{self.wp_password}".encode()).decode()
-            
-        headers = {
-            'Authorization': f'Basic {credentials}',
-            'Content-Type': 'application/json'
-        }
-        
         # 포스트 데이터
         post_data = {
             'title': title,
@@ -191,9 +759,62 @@ class WordPressAutoPoster:
             'date': post_date_str  # 포스트 날짜 설정
         }
         
+        # 미디어 라이브러리에 올린 첫 이미지를 대표 이미지로 설정
+        attachment_ids = [image['id'] for image in images or [] if isinstance(image, dict) and 'id' in image]
+        if attachment_ids:
+            post_data['featured_media'] = attachment_ids[0]
+        
+        # 자동 포스팅 태그 (배치 API 요청에도 그대로 포함됨)
+        tag_id = self.auto_post_tag_id()
+        if tag_id:
+            post_data['tags'] = [tag_id]
+        return post_data
+    
+    def auto_post_tag_id(self):
+        """자동 포스팅 표시 태그 ID (없으면 만들고, tag_posts가 꺼져 있거나 실패하면 None)
+        
+        처음 한 번만 REST API로 조회/생성합니다. 실패하면 포스트마다 다시
+        시도하지 않도록 이번 실행 동안 표시를 끕니다.
+        """
+        with self._tag_lock:
+            if not self.tag_posts:
+                return None
+            if self._auto_post_tag_id:
+                return self._auto_post_tag_id
+            
+            api_url = f"{self.wp_url}/wp-json/wp/v2/tags"
+            try:
+                self._rate_acquire('rest')
+                started = time.monotonic()
+                response = self.session.get(
+                    api_url, params={'slug': AUTO_POST_TAG_SLUG, '_fields': 'id'}, timeout=self.http_timeout
+                )
+                self._rate_record('rest', started, response)
+                response.raise_for_status()
+                tags = response.json()
+                if tags:
+                    self._auto_post_tag_id = tags[0]['id']
+                else:
+                    response = self._rest_post(api_url, {'name': AUTO_POST_TAG_SLUG, 'slug': AUTO_POST_TAG_SLUG})
+                    response.raise_for_status()
+                    self._auto_post_tag_id = response.json()['id']
+            except (requests.exceptions.RequestException, ValueError, KeyError, TypeError, IndexError) as e:
+                print(f"  자동 포스팅 태그 준비 실패: {e}")
+                print("  이번 실행 동안 포스트 표시를 끕니다 (tag_posts)")
+                self.tag_posts = False
+                return None
+            return self._auto_post_tag_id
+    
+    def create_wp_post(self, title, content, post_number, images=None, status='draft'):
+        """WordPress REST API를 통해 포스트 생성"""
+        post_data = self._build_post_data(title, content, post_number, images, status)
+        
+        # WordPress REST API 엔드포인트
+        api_url = f"{self.wp_url}/wp-json/wp/v2/posts"
+        
         try:
             print(f"API URL: {api_url}")
-            response = requests.post(api_url, headers=headers, json=post_data)
+            response = self._rest_post_retrying(api_url, post_data, [title])
             
             if response.status_code >= 400:
                 print(f"오류 응답: {response.status_code}")
@@ -205,80 +826,419 @@ class WordPressAutoPoster:
             print(f"포스트 생성 실패: {e}")
             return None
     
-    def process_posts(self, txt_file, start_post=None, end_post=None, status='draft'):
-        """포스트들을 처리하여 WordPress에 업로드"""
-        posts = self.parse_posts_from_txt(txt_file)
-        
-        # 범위 필터링
-        if start_post is not None:
-            posts = [p for p in posts if p['number'] >= start_post]
-        if end_post is not None:
-            posts = [p for p in posts if p['number'] <= end_post]
+    def create_wp_posts_batch(self, post_requests):
+        """WordPress 배치 API(/wp-json/batch/v1)로 여러 포스트를 생성
         
+        post_requests는 create_wp_post의 인자 딕셔너리 목록이며, 반환값은
+        같은 순서의 결과 목록입니다 (실패한 항목은 None). 서버가 배치 API를
+        지원하지 않으면 포스트마다 개별 요청으로 처리합니다.
+        """
         results = []
+        for i in range(0, len(post_requests), REST_BATCH_LIMIT):
+            chunk = post_requests[i:i + REST_BATCH_LIMIT]
+            
+            if self.rest_batch_supported:
+                chunk_results = self._send_rest_batch(chunk)
+                if chunk_results is not None:
+                    results.extend(chunk_results)
+                    continue
+            
+            # 배치 API 미지원: 개별 요청으로 처리
+            results.extend(self.create_wp_post(**post_request) for post_request in chunk)
         
-        for post in posts:
-            print(f"처리 중: 포스트 {post['number']} - {post['title']}")
+        return results
+    
+    def _send_rest_batch(self, chunk):
+        """배치 요청 한 번 전송 (배치 API 미지원이면 None 반환)"""
+        api_url = f"{self.wp_url}/wp-json/batch/v1"
+        batch_data = {
+            'validation': 'normal',
+            'requests': [
+                {
+                    'method': 'POST',
+                    'path': '/wp/v2/posts',
+                    'body': self._build_post_data(**post_request)
+                }
+                for post_request in chunk
+            ]
+        }
+        
+        try:
+            print(f"API URL: {api_url} ({len(chunk)}개 포스트)")
+            response = self._rest_post_retrying(
+                api_url, batch_data, [post_request['title'] for post_request in chunk], units=len(chunk)
+            )
             
-            # 이미지 찾기
-            local_images = self.get_post_images(post['number'])
-            uploaded_images = []
+            # WordPress 5.6 미만이거나 배치 라우트가 막혀 있는 경우
+            if response.status_code in (404, 405, 501):
+                print(f"배치 API 미지원 ({response.status_code}), 개별 요청으로 전환합니다")
+                self.rest_batch_supported = False
+                return None
             
-            # 이미지 업로드
-            for img_path in local_images:
-                print(f"  이미지 업로드 중: {img_path}")
-                img_url = self.upload_image_via_sftp(img_path, post['number'])
-                if img_url:
-                    uploaded_images.append(img_url)
+            if response.status_code >= 400:
+                print(f"오류 응답: {response.status_code}")
+                print(f"응답 내용: {response.text[:200]}")
             
-            # WordPress 포스트 생성
-            wp_result = self.create_wp_post(
-                title=post['title'],
-                content=post['content'],
-                post_number=post['number'],
-                images=uploaded_images,
-                status=status
-            )
+            response.raise_for_status()
+            responses = response.json().get('responses', [])
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"배치 포스트 생성 실패: {e}")
+            if self._may_have_reached_server(e):
+                return self._recover_rest_batch(chunk)
+            return [None] * len(chunk)
+        
+        # 하위 응답을 요청 순서대로 결과에 매핑
+        results = []
+        for i in range(len(chunk)):
+            sub_response = responses[i] if i < len(responses) else {}
+            if sub_response.get('status', 500) < 400:
+                results.append(sub_response.get('body'))
+            else:
+                print(f"오류 응답: {sub_response.get('status')}")
+                print(f"응답 내용: {str(sub_response.get('body'))[:200]}")
+                results.append(None)
+        return results
+    
+    def _recover_rest_batch(self, chunk):
+        """결과를 모르는 배치 요청의 포스트를 제목으로 하나씩 확인해 결과 목록 생성
+        
+        이미 만들어진 포스트는 찾은 ID를 결과로 쓰고, 없는 포스트만 개별
+        요청으로 다시 만듭니다. 확인할 수 없으면 모두 실패로 둡니다.
+        """
+        found = self.find_posts_by_title([post_request['title'] for post_request in chunk])
+        if found is None:
+            return [None] * len(chunk)
+        
+        results = []
+        for post_request in chunk:
+            post_id = found.get(self._title_key(post_request['title']))
+            if post_id is not None:
+                print(f"  이미 생성됨: {post_request['title']} (포스트 ID {post_id})")
+                results.append({'id': post_id})
+            else:
+                results.append(self.create_wp_post(**post_request))
+        return results
+    
+    def prepare_post_images(self, post_number, log_prefix='  '):
+        """포스트의 이미지를 찾아 업로드하고 URL 목록 반환
+        
+        작업 저널에 이 포스트의 업로드 기록이 있으면 다시 올리지 않고
+        기록된 URL을 사용합니다. 일부 이미지가 실패한 경우에는 기록하지
+        않으므로 이어서 실행할 때 다시 시도합니다.
+        """
+        if self.journal is not None:
+            image_urls = self.journal.uploaded_images(post_number)
+            if image_urls is not None:
+                print(f"{log_prefix}저널에 기록된 이미지 {len(image_urls)}개 사용")
+                return image_urls
+        
+        # 이미지 찾기 및 업로드
+        local_images = self.get_post_images(post_number)
+        image_urls = self.upload_post_images(local_images, post_number, log_prefix)
+        
+        if self.journal is not None and len(image_urls) == len(local_images):
+            self.journal.record_images(post_number, image_urls)
+        return image_urls
+    
+    def _upload_post_stage(self, post):
+        """포스트의 이미지를 찾아 업로드하고 URL 목록 반환"""
+        print(f"처리 중: 포스트 {post['number']} - {post['title']}")
+        if self._is_duplicate(post):
+            return []
+        return self.prepare_post_images(post['number'])
+    
+    def _post_request(self, post, uploaded_images, status):
+        """create_wp_post 인자 딕셔너리 생성"""
+        return {
+            'title': post['title'],
+            'content': post['content'],
+            'post_number': post['number'],
+            'images': uploaded_images,
+            'status': status
+        }
+    
+    def _create_post_stage(self, post, uploaded_images, status):
+        """WordPress 포스트를 생성하고 결과 딕셔너리 반환 (중복 여부는 생성 직전에 확인)"""
+        if not self._claim_title(post):
+            return self._skipped_result(post)
+        wp_result = None
+        try:
+            wp_result = self.create_wp_post(**self._post_request(post, uploaded_images, status))
+        finally:
+            self._release_title(post, bool(wp_result))
+        return self._post_result(post, wp_result, uploaded_images)
+    
+    def _create_posts_batch_stage(self, posts, uploaded, status):
+        """포스트들을 배치 API로 생성하고 같은 순서의 결과 목록 반환
+        
+        요청을 만들기 전에 순서대로 제목을 선점하므로, 같은 배치 안에서 제목이
+        겹치면 앞의 포스트만 만들고 나머지는 건너뜁니다.
+        """
+        results = [None] * len(posts)
+        claimed = []
+        for i, post in enumerate(posts):
+            if self._claim_title(post):
+                claimed.append(i)
+            else:
+                results[i] = self._skipped_result(post)
+        
+        wp_results = [None] * len(claimed)
+        try:
+            wp_results = self.create_wp_posts_batch([
+                self._post_request(posts[i], uploaded[i], status) for i in claimed
+            ])
+        finally:
+            for i, wp_result in zip(claimed, wp_results):
+                self._release_title(posts[i], bool(wp_result))
+        
+        for i, wp_result in zip(claimed, wp_results):
+            results[i] = self._post_result(posts[i], wp_result, uploaded[i])
+        return results
+    
+    def _post_result(self, post, wp_result, uploaded_images):
+        """포스트 생성 결과 딕셔너리 생성 (작업 저널에도 기록)"""
+        if wp_result:
+            print(f"  성공: 포스트 ID {wp_result.get('id')}")
+            result = {
+                'post_number': post['number'],
+                'wp_id': wp_result.get('id'),
+                'title': post['title'],
+                'status': 'success',
+                'images_count': len(uploaded_images)
+            }
+        else:
+            print(f"  실패: 포스트 생성 오류")
+            result = {
+                'post_number': post['number'],
+                'title': post['title'],
+                'status': 'failed',
+                'images_count': len(uploaded_images)
+            }
+        
+        if wp_result and self.tag_source_meta:
+            self.tag_created_post(wp_result.get('id'), post['number'])
+        self.record_result(result)
+        return result
+    
+    def tag_created_post(self, wp_id, post_number):
+        """생성한 포스트에 원본 표시 메타 추가 ("파일명#번호")
+        
+        REST API는 등록되지 않은 메타 키를 무시하므로 wp_postmeta에 직접
+        기록합니다. meta_key는 인덱스가 있어 정리 시 전체 스캔이 없습니다.
+        실패하면 포스트마다 연결을 기다리지 않도록 이번 실행 동안 기록을 끕니다.
+        """
+        try:
+            with self.db_pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "INSERT INTO wp_postmeta (post_id, meta_key, meta_value) VALUES (%s, %s, %s)",
+                    [wp_id, SOURCE_META_KEY, f"{self.source_file}#{post_number}"]
+                )
+                conn.commit()
+                cursor.close()
+        except Exception as e:
+            print(f"  포스트 표시 실패: 포스트 ID {wp_id}, 오류: {e}")
+            print("  이번 실행 동안 원본 메타 기록을 끕니다 (tag_source_meta)")
+            self.tag_source_meta = False
+    
+    def _skipped_result(self, post):
+        """이미 같은 제목의 포스트가 있어 건너뛴 결과 딕셔너리 생성"""
+        print(f"  건너뜀: 같은 제목의 포스트가 이미 있습니다")
+        result = {
+            'post_number': post['number'],
+            'title': post['title'],
+            'status': 'skipped_duplicate',
+            'images_count': 0
+        }
+        self.record_result(result)
+        return result
+    
+    def record_result(self, result):
+        """포스트 결과를 작업 저널에 기록"""
+        if self.journal is not None:
+            self.journal.record_result(result['post_number'], result)
+    
+    def start_job(self, txt_file, resume=False):
+        """작업 저널 시작 (같은 파일/사이트의 기록을 이어서 사용)"""
+        self.source_file = os.path.basename(txt_file)
+        if self.journal is None:
+            if resume:
+                print("작업 저널이 꺼져 있어 이어서 실행할 수 없습니다. 처음부터 실행합니다.")
+            return
+        self.journal.start(f"{os.path.abspath(txt_file)}|{self.wp_url}")
+    
+    def iter_pending_posts(self, posts, resume=True):
+        """resume이면 작업 저널에서 이미 성공한 포스트를 건너뛰고, 아니면 처리할 포스트의 이전 기록만 삭제
+        
+        이번 실행 범위 밖의 포스트 기록은 남으므로, 범위를 나눠 실행한 뒤에도
+        --resume이 앞선 범위의 포스트를 다시 만들지 않습니다.
+        """
+        for post in posts:
+            if self.journal is not None:
+                if not resume:
+                    self.journal.forget(post['number'])
+                elif self.journal.finished_result(post['number']):
+                    print(f"건너뜀 (이미 완료): 포스트 {post['number']} - {post['title']}")
+                    continue
+            yield post
+    
+    def _process_posts_rest_batch(self, posts, status, rest_batch_size):
+        """rest_batch_size개씩 이미지를 올린 뒤 배치 API 요청 한 번으로 생성"""
+        results = []
+        posts = iter(posts)
+        while True:
+            chunk = list(itertools.islice(posts, rest_batch_size))
+            if not chunk:
+                break
             
-            if wp_result:
-                print(f"  성공: 포스트 ID {wp_result.get('id')}")
-                results.append({
-                    'post_number': post['number'],
-                    'wp_id': wp_result.get('id'),
-                    'title': post['title'],
-                    'status': 'success',
-                    'images_count': len(uploaded_images)
-                })
+            uploaded = [self._upload_post_stage(post) for post in chunk]
+            results.extend(self._create_posts_batch_stage(chunk, uploaded, status))
+        return results
+    
+    def _process_posts_pipelined(self, posts, status, depth=2):
+        """파싱 → 이미지 업로드 → 포스트 생성을 단계별 스레드로 겹쳐 실행
+        
+        단계 사이는 크기 depth의 큐로 연결되어, 포스트 N을 생성하는 동안
+        포스트 N+1의 이미지를 업로드합니다. 각 단계는 스레드 하나가
+        순서대로 처리하므로 결과 순서는 순차 실행과 같습니다.
+        """
+        done = object()
+        stop = threading.Event()
+        errors = []
+        parsed_queue = queue.Queue(maxsize=depth)
+        uploaded_queue = queue.Queue(maxsize=depth)
+        
+        def put(q, item):
+            # 소비 단계가 중단되면 블로킹된 생산 단계도 빠져나오도록 주기적으로 확인
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def get(q):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return done
+        
+        def parse_stage():
+            try:
+                for post in posts:
+                    if not put(parsed_queue, post):
+                        return
+            except Exception as e:
+                errors.append(e)
+            finally:
+                put(parsed_queue, done)
+        
+        def upload_stage():
+            try:
+                while True:
+                    post = get(parsed_queue)
+                    if post is done:
+                        break
+                    if not put(uploaded_queue, (post, self._upload_post_stage(post))):
+                        return
+            except Exception as e:
+                errors.append(e)
+            finally:
+                put(uploaded_queue, done)
+        
+        threads = [
+            threading.Thread(target=parse_stage, daemon=True),
+            threading.Thread(target=upload_stage, daemon=True)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        results = []
+        try:
+            while True:
+                item = uploaded_queue.get()
+                if item is done:
+                    break
+                post, uploaded_images = item
+                results.append(self._create_post_stage(post, uploaded_images, status))
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        
+        if errors:
+            raise errors[0]
+        return results
+    
+    def process_posts(self, txt_file, start_post=None, end_post=None, status='draft', pipeline=False,
+                      rest_batch_size=None, resume=False, posts=None):
+        """포스트들을 처리하여 WordPress에 업로드
+        
+        resume이 True이면 작업 저널을 보고 이미 성공한 포스트는 건너뛰고,
+        업로드가 끝난 이미지는 다시 올리지 않습니다. posts가 주어지면
+        txt_file을 다시 파싱하지 않고 그 포스트들을 처리합니다.
+        """
+        self.start_job(txt_file, resume)
+        
+        # 포스트는 필요할 때 하나씩 파싱 (범위 필터링 포함)
+        if posts is None:
+            posts = self.iter_posts_from_txt(txt_file, start_post, end_post)
+        posts = self.iter_pending_posts(posts, resume)
+        
+        try:
+            if rest_batch_size:
+                results = self._process_posts_rest_batch(posts, status, rest_batch_size)
+            elif pipeline:
+                results = self._process_posts_pipelined(posts, status)
             else:
-                print(f"  실패: 포스트 생성 오류")
-                results.append({
-                    'post_number': post['number'],
-                    'title': post['title'],
-                    'status': 'failed',
-                    'images_count': len(uploaded_images)
-                })
+                results = []
+                for post in posts:
+                    uploaded_images = self._upload_post_stage(post)
+                    results.append(self._create_post_stage(post, uploaded_images, status))
+        finally:
+            # 실행이 끝나면 SFTP 연결 정리
+            self.close()
         
         return results
     
+    def close(self):
+        """SFTP 연결 풀, HTTP 세션, 업로드 캐시, 작업 저널, 최적화 프로세스 풀 정리"""
+        if self.sftp_pool is not None:
+            self.sftp_pool.close()
+        self.session.close()
+        if self.upload_cache is not None:
+            self.upload_cache.close()
+        if self.journal is not None:
+            self.journal.close()
+        if self.image_optimizer is not None:
+            self.image_optimizer.close()
+        self._remote_dirs.clear()
+    
     def get_db_connection(self):
-        """MySQL 데이터베이스 연결"""
-        return mysql.connector.connect(**self.db_config)
+        """MySQL 데이터베이스 연결 (풀에서 빌림, close()하면 반납)"""
+        return self.db_pool.get_connection()
     
     def check_existing_posts(self):
-        """기존 포스트 확인 (중복 방지용)"""
+        """기존 포스트 확인 (제목과 상태 목록)
+        
+        post_title에는 인덱스가 없어 모든 포스트를 읽습니다. 실행 중 중복
+        확인은 이 함수 대신 REST API 검색(find_posts_by_title)을 씁니다.
+        """
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            query = "SELECT post_title, post_status FROM wp_posts WHERE post_type = 'post'"
-            cursor.execute(query)
-            
-            existing_posts = cursor.fetchall()
-            cursor.close()
-            conn.close()
-            
-            return existing_posts
-            
+            with self.db_pool.connection() as conn:
+                cursor = conn.cursor()
+                
+                query = "SELECT post_title, post_status FROM wp_posts WHERE post_type = 'post'"
+                cursor.execute(query)
+                
+                existing_posts = cursor.fetchall()
+                cursor.close()
+                
+                return existing_posts
+                
         except Exception as e:
             print(f"데이터베이스 조회 실패: {e}")
             return []
@@ -294,17 +1254,50 @@ def main():
     parser.add_argument('--status', default='draft', choices=['draft', 'publish'], 
                        help='포스트 상태 (draft 또는 publish)')
     parser.add_argument('--config', default='wp_config.json', help='설정 파일')
+    parser.add_argument('--upload-workers', type=int, help='이미지 동시 업로드 워커 수')
+    parser.add_argument('--upload-method', choices=['sftp', 'media'],
+                       help='이미지 업로드 방식 (media: WordPress 미디어 라이브러리, SFTP 불필요)')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='다음 포스트의 이미지 업로드와 현재 포스트 생성을 겹쳐 실행')
+    parser.add_argument('--rest-batch', type=int, metavar='N',
+                       help=f'배치 API로 N개(최대 {REST_BATCH_LIMIT})씩 묶어 포스트 생성')
+    parser.add_argument('--resume', action='store_true',
+                       help='작업 저널을 보고 완료된 포스트는 건너뛰고 실패한 것만 다시 처리')
+    parser.add_argument('--skip-duplicates', action='store_true',
+                       help='같은 제목의 포스트가 이미 있으면 건너뜀 (데이터베이스 접근 필요)')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                       help='asyncio 엔진으로 여러 포스트를 동시에 처리')
     
     args = parser.parse_args()
     
     try:
-        poster = WordPressAutoPoster(args.config)
-        results = poster.process_posts(
-            txt_file=args.txt_file,
-            start_post=args.start,
-            end_post=args.end,
-            status=args.status
-        )
+        if args.use_async:
+            from async_poster import AsyncWordPressAutoPoster
+            poster = AsyncWordPressAutoPoster(
+                args.config, upload_workers=args.upload_workers, upload_method=args.upload_method
+            )
+            poster.skip_duplicates = poster.skip_duplicates or args.skip_duplicates
+            results = poster.run(
+                txt_file=args.txt_file,
+                start_post=args.start,
+                end_post=args.end,
+                status=args.status,
+                resume=args.resume
+            )
+        else:
+            poster = WordPressAutoPoster(
+                args.config, upload_workers=args.upload_workers, upload_method=args.upload_method
+            )
+            poster.skip_duplicates = poster.skip_duplicates or args.skip_duplicates
+            results = poster.process_posts(
+                txt_file=args.txt_file,
+                start_post=args.start,
+                end_post=args.end,
+                status=args.status,
+                pipeline=args.pipeline,
+                rest_batch_size=args.rest_batch,
+                resume=args.resume
+            )
         
         # 결과 요약
         success_count = len([r for r in results if r['status'] == 'success'])
@@ -312,6 +1305,9 @@ def main():
         
         print(f"\n=== 처리 완료 ===")
         print(f"성공: {success_count}/{total_count}")
+        skipped_count = len([r for r in results if r['status'] == 'skipped_duplicate'])
+        if skipped_count:
+            print(f"중복으로 건너뜀: {skipped_count}")
         
         # 결과를 JSON 파일로 저장
         with open(f'posting_results_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json', 'w', encoding='utf-8') as f:
@@ -4,10 +4,20 @@ WordPress 유틸리티 함수들
 데이터베이스 직접 조작 및 관리 기능
 """
 
-import mysql.connector
+import io
+import gzip
 import json
 import os
-from datetime import datetime
+import re
+import time
+from datetime import datetime, timedelta
+from db_pool import DatabasePool
+
+# wp_auto_poster.py가 생성한 포스트에 붙이는 태그 슬러그
+AUTO_POST_TAG_SLUG = 'wp-auto-poster'
+
+# tag_source_meta를 켜면 함께 기록하는 원본 메타 키 (값: "파일명#포스트번호")
+SOURCE_META_KEY = '_wp_auto_poster_source'
 
 class WordPressUtils:
     def __init__(self, config_file='wp_config.json'):
@@ -15,153 +25,356 @@ class WordPressUtils:
         with open(config_file, 'r', encoding='utf-8') as f:
             self.config = json.load(f)
         self.db_config = self.config['database']
+        
+        # 같은 설정을 쓰는 WordPressAutoPoster와 연결 풀 공유
+        self.db_pool = DatabasePool.for_config(self.db_config)
+        
+        # 대량 삭제/상태 변경은 청크 단위로 나눠 커밋 (사이트 테이블 잠금 최소화)
+        maintenance = self.config.get('maintenance', {})
+        self.chunk_size = maintenance.get('chunk_size', 500)
+        self.chunk_sleep = maintenance.get('chunk_sleep', 0)
     
     def get_db_connection(self):
-        """MySQL 데이터베이스 연결"""
-        return mysql.connector.connect(**self.db_config)
+        """MySQL 데이터베이스 연결 (풀에서 빌림, close()하면 반납)"""
+        return self.db_pool.get_connection()
     
-    def get_all_posts(self, post_type='post', status=None):
-        """모든 포스트 조회"""
+    def get_all_posts(self, post_type='post', status=None, columns=None):
+        """모든 포스트 조회 (최신순)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor(dictionary=True)
-            
-            query = "SELECT * FROM wp_posts WHERE post_type = %s"
-            params = [post_type]
-            
-            if status:
-                query += " AND post_status = %s"
-                params.append(status)
-            
-            query += " ORDER BY post_date DESC"
-            
-            cursor.execute(query, params)
-            posts = cursor.fetchall()
-            
-            cursor.close()
-            conn.close()
-            
-            return posts
-            
+            return list(self.iter_posts(columns, post_type=post_type, status=status))
+                
         except Exception as e:
             print(f"포스트 조회 실패: {e}")
             return []
     
-    def delete_posts_by_title_pattern(self, pattern):
-        """제목 패턴으로 포스트 삭제"""
+    def iter_posts(self, columns=None, post_type='post', status=None, date_from=None, date_to=None,
+                   page_size=500):
+        """포스트를 최신순으로 한 페이지씩 읽어 하나씩 생성
+        
+        (post_date, ID) 키셋으로 페이지를 넘기므로 OFFSET 스캔이 없고,
+        메모리에는 한 페이지만 유지됩니다. columns를 주면 그 컬럼만 조회하며
+        키셋에 필요한 ID, post_date는 항상 포함됩니다. status는 문자열 또는
+        목록, 날짜 범위는 date_from 이상 date_to 미만입니다.
+        """
+        columns = list(columns) if columns else ['*']
+        for column in columns:
+            if column != '*' and not re.match(r'^\w+$', column):
+                raise ValueError(f"잘못된 컬럼 이름입니다: {column}")
+        if '*' not in columns:
+            columns += [c for c in ('ID', 'post_date') if c not in columns]
+        
+        conditions = ["post_type = %s"]
+        params = [post_type]
+        if status:
+            statuses = [status] if isinstance(status, str) else list(status)
+            conditions.append(f"post_status IN ({','.join(['%s'] * len(statuses))})")
+            params += statuses
+        if date_from:
+            conditions.append("post_date >= %s")
+            params.append(date_from)
+        if date_to:
+            conditions.append("post_date < %s")
+            params.append(date_to)
+        
+        base_query = f"SELECT {', '.join(columns)} FROM wp_posts WHERE {' AND '.join(conditions)}"
+        order = " ORDER BY post_date DESC, ID DESC LIMIT %s"
+        last_key = None
+        
+        with self.db_pool.connection() as conn:
+            while True:
+                if last_key is None:
+                    query = base_query + order
+                    page_params = params + [page_size]
+                else:
+                    query = base_query + " AND (post_date < %s OR (post_date = %s AND ID < %s))" + order
+                    page_params = params + [last_key[0], last_key[0], last_key[1], page_size]
+                
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute(query, page_params)
+                rows = cursor.fetchall()
+                cursor.close()
+                
+                for row in rows:
+                    yield row
+                
+                if len(rows) < page_size:
+                    return
+                last_key = (rows[-1]['post_date'], rows[-1]['ID'])
+    
+    def delete_posts_by_title_pattern(self, pattern, tagged_only=False):
+        """제목 패턴으로 포스트 삭제 (tagged_only면 자동 포스팅으로 만든 포스트 중에서만)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # 먼저 삭제할 포스트들 조회
-            query = "SELECT ID, post_title FROM wp_posts WHERE post_title LIKE %s"
-            cursor.execute(query, [f"%{pattern}%"])
-            posts_to_delete = cursor.fetchall()
-            
-            if not posts_to_delete:
-                print(f"패턴 '{pattern}'에 해당하는 포스트가 없습니다.")
-                return 0
-            
-            print(f"삭제할 포스트 {len(posts_to_delete)}개:")
-            for post_id, title in posts_to_delete:
-                print(f"  - ID {post_id}: {title}")
-            
-            confirm = input("정말 삭제하시겠습니까? (y/N): ")
-            if confirm.lower() != 'y':
-                print("삭제가 취소되었습니다.")
-                return 0
-            
-            # 포스트 삭제
-            delete_query = "DELETE FROM wp_posts WHERE post_title LIKE %s"
-            cursor.execute(delete_query, [f"%{pattern}%"])
-            
-            deleted_count = cursor.rowcount
-            conn.commit()
-            
-            cursor.close()
-            conn.close()
+            with self.db_pool.connection() as conn:
+                cursor = conn.cursor()
+                
+                # 먼저 삭제할 포스트들 조회 (삭제는 조회한 ID로만 수행)
+                if tagged_only:
+                    query, params = self._marked_posts_query("p.ID, p.post_title")
+                    cursor.execute(query + " AND p.post_title LIKE %s", params + [f"%{pattern}%"])
+                else:
+                    query = "SELECT ID, post_title FROM wp_posts WHERE post_title LIKE %s"
+                    cursor.execute(query, [f"%{pattern}%"])
+                posts_to_delete = cursor.fetchall()
+                
+                if not posts_to_delete:
+                    print(f"패턴 '{pattern}'에 해당하는 포스트가 없습니다.")
+                    return 0
+                
+                print(f"삭제할 포스트 {len(posts_to_delete)}개:")
+                for post_id, title in posts_to_delete:
+                    print(f"  - ID {post_id}: {title}")
+                
+                confirm = input("정말 삭제하시겠습니까? (y/N): ")
+                if confirm.lower() != 'y':
+                    print("삭제가 취소되었습니다.")
+                    return 0
+                
+                cursor.close()
+                
+            # 포스트 삭제 (관련 메타/분류/댓글 포함)
+            deleted_count = self.delete_posts_by_ids([post_id for post_id, _ in posts_to_delete])
             
             print(f"{deleted_count}개 포스트가 삭제되었습니다.")
             return deleted_count
-            
+                
         except Exception as e:
             print(f"포스트 삭제 실패: {e}")
             return 0
     
-    def update_post_status(self, post_ids, new_status):
-        """포스트 상태 변경"""
+    def update_post_status(self, post_ids, new_status, chunk_size=None, sleep=None):
+        """포스트 상태 변경 (청크마다 커밋)"""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
             if isinstance(post_ids, int):
                 post_ids = [post_ids]
             
-            placeholders = ','.join(['%s'] * len(post_ids))
-            query = f"UPDATE wp_posts SET post_status = %s WHERE ID IN ({placeholders})"
-            
-            params = [new_status] + post_ids
-            cursor.execute(query, params)
-            
-            updated_count = cursor.rowcount
-            conn.commit()
-            
-            cursor.close()
-            conn.close()
+            updated_count = 0
+            with self.db_pool.connection() as conn:
+                cursor = conn.cursor()
+                
+                for chunk in self._run_in_chunks(post_ids, chunk_size, sleep, "상태 변경"):
+                    placeholders = ','.join(['%s'] * len(chunk))
+                    query = f"UPDATE wp_posts SET post_status = %s WHERE ID IN ({placeholders})"
+                    
+                    cursor.execute(query, [new_status] + chunk)
+                    updated_count += cursor.rowcount
+                    conn.commit()
+                
+                cursor.close()
             
             print(f"{updated_count}개 포스트의 상태가 '{new_status}'로 변경되었습니다.")
             return updated_count
-            
+                
         except Exception as e:
             print(f"포스트 상태 변경 실패: {e}")
             return 0
     
-    def get_post_statistics(self):
-        """포스트 통계 조회"""
-        try:
-            conn = self.get_db_connection()
+    def delete_posts_by_ids(self, post_ids, chunk_size=None, sleep=None):
+        """포스트와 관련 행(리비전, 메타, 분류 연결, 댓글, 댓글 메타)을 청크 단위로 삭제
+        
+        청크마다 관련 테이블을 함께 지우고 연결이 끊긴 카테고리/태그의 포스트 수
+        (wp_term_taxonomy.count)를 다시 센 뒤 커밋하므로, 중간에 멈춰도 고아 행이나
+        틀린 개수가 남지 않습니다. 첨부파일은 WordPress처럼 삭제하지 않고 연결만 끊습니다.
+        삭제된 포스트 수(리비전 제외)를 반환합니다.
+        """
+        deleted_count = 0
+        with self.db_pool.connection() as conn:
             cursor = conn.cursor()
             
-            # 상태별 포스트 수
-            cursor.execute("""
-                SELECT post_status, COUNT(*) as count 
-                FROM wp_posts 
-                WHERE post_type = 'post' 
-                GROUP BY post_status
-            """)
-            status_stats = cursor.fetchall()
-            
-            # 최근 포스트
-            cursor.execute("""
-                SELECT post_title, post_date, post_status 
-                FROM wp_posts 
-                WHERE post_type = 'post' 
-                ORDER BY post_date DESC 
-                LIMIT 10
-            """)
-            recent_posts = cursor.fetchall()
+            for chunk in self._run_in_chunks(list(post_ids), chunk_size, sleep, "삭제"):
+                placeholders = ','.join(['%s'] * len(chunk))
+                
+                # 리비전/자동 저장도 같은 청크에서 함께 삭제
+                cursor.execute(
+                    f"SELECT ID FROM wp_posts WHERE post_type = 'revision' AND post_parent IN ({placeholders})",
+                    chunk
+                )
+                revision_ids = [row[0] for row in cursor.fetchall()]
+                ids = list(chunk) + revision_ids
+                id_placeholders = ','.join(['%s'] * len(ids))
+                
+                cursor.execute(
+                    "DELETE FROM wp_commentmeta WHERE comment_id IN "
+                    f"(SELECT comment_ID FROM wp_comments WHERE comment_post_ID IN ({placeholders}))",
+                    chunk
+                )
+                cursor.execute(f"DELETE FROM wp_comments WHERE comment_post_ID IN ({placeholders})", chunk)
+                cursor.execute(f"DELETE FROM wp_postmeta WHERE post_id IN ({id_placeholders})", ids)
+                
+                # 연결을 지우기 전에 포스트 수를 다시 셀 분류 기록
+                cursor.execute(
+                    f"SELECT DISTINCT term_taxonomy_id FROM wp_term_relationships WHERE object_id IN ({id_placeholders})",
+                    ids
+                )
+                term_taxonomy_ids = [row[0] for row in cursor.fetchall()]
+                cursor.execute(f"DELETE FROM wp_term_relationships WHERE object_id IN ({id_placeholders})", ids)
+                cursor.execute(
+                    f"UPDATE wp_posts SET post_parent = 0 WHERE post_type = 'attachment' AND post_parent IN ({placeholders})",
+                    chunk
+                )
+                if revision_ids:
+                    cursor.execute(
+                        f"DELETE FROM wp_posts WHERE ID IN ({','.join(['%s'] * len(revision_ids))})",
+                        revision_ids
+                    )
+                cursor.execute(f"DELETE FROM wp_posts WHERE ID IN ({placeholders})", chunk)
+                deleted_count += cursor.rowcount
+                
+                # WordPress처럼 공개된 포스트만 세어 분류별 포스트 수 갱신
+                if term_taxonomy_ids:
+                    cursor.execute(
+                        "UPDATE wp_term_taxonomy SET count = ("
+                        "SELECT COUNT(*) FROM wp_term_relationships r JOIN wp_posts p ON p.ID = r.object_id "
+                        "WHERE r.term_taxonomy_id = wp_term_taxonomy.term_taxonomy_id AND p.post_status = 'publish'"
+                        f") WHERE term_taxonomy_id IN ({','.join(['%s'] * len(term_taxonomy_ids))})",
+                        term_taxonomy_ids
+                    )
+                conn.commit()
             
             cursor.close()
-            conn.close()
+        
+        return deleted_count
+    
+    def _run_in_chunks(self, items, chunk_size=None, sleep=None, label="처리"):
+        """목록을 청크로 나눠 생성하고, 청크 사이에 진행률 출력 및 대기"""
+        chunk_size = chunk_size or self.chunk_size
+        sleep = self.chunk_sleep if sleep is None else sleep
+        total = len(items)
+        
+        for start in range(0, total, chunk_size):
+            if start and sleep:
+                time.sleep(sleep)
+            chunk = items[start:start + chunk_size]
+            yield chunk
+            print(f"  {label} 진행: {min(start + chunk_size, total)}/{total}")
+    
+    def get_post_statistics(self, use_cache=True, as_json=False, days=30, weeks=12):
+        """포스트 통계 조회
+        
+        상태별/타입별/일별/주별 개수와 최근 포스트를 쿼리 한 번(UNION ALL)으로
+        가져옵니다. 결과는 stats.cache_ttl초(기본값 60) 동안 로컬 캐시 파일에
+        저장되어, 자주 호출해도 데이터베이스에 다시 묻지 않습니다.
+        """
+        try:
+            stats = self._load_cached_stats() if use_cache else None
+            if stats is None:
+                stats = self._query_post_statistics(days, weeks)
+                self._save_cached_stats(stats)
+            
+            if as_json:
+                print(json.dumps(stats, ensure_ascii=False))
+                return stats
             
             print("=== WordPress 포스트 통계 ===")
+            if stats['cached']:
+                print(f"(캐시: {stats['generated_at']} 기준)")
             print("상태별 포스트 수:")
-            for status, count in status_stats:
+            for status, count in stats['status_stats']:
                 print(f"  {status}: {count}개")
             
+            print("\n타입별 개수:")
+            for post_type, count in stats['type_stats']:
+                print(f"  {post_type}: {count}개")
+            
+            print(f"\n최근 {days}일 일별 포스트 수:")
+            for day, count in stats['daily']:
+                print(f"  {day}: {count}개")
+            
+            print(f"\n최근 {weeks}주 주별 포스트 수:")
+            for week, count in stats['weekly']:
+                print(f"  {week}: {count}개")
+            
             print(f"\n최근 포스트 10개:")
-            for title, date, status in recent_posts:
+            for title, date, status in stats['recent_posts']:
                 print(f"  [{status}] {title} ({date})")
             
-            return {
-                'status_stats': status_stats,
-                'recent_posts': recent_posts
-            }
-            
+            return stats
+                
         except Exception as e:
             print(f"통계 조회 실패: {e}")
             return None
     
+    def _query_post_statistics(self, days, weeks):
+        """통계용 집계를 쿼리 한 번으로 조회"""
+        query = """
+            SELECT 'status' AS kind, post_status AS label, NULL AS status, NULL AS date, COUNT(*) AS count
+            FROM wp_posts WHERE post_type = 'post' GROUP BY post_status
+            UNION ALL
+            SELECT 'type', post_type, NULL, NULL, COUNT(*)
+            FROM wp_posts GROUP BY post_type
+            UNION ALL
+            SELECT 'day', CAST(DATE(post_date) AS CHAR), NULL, NULL, COUNT(*)
+            FROM wp_posts WHERE post_type = 'post' AND post_date >= CURDATE() - INTERVAL %s DAY
+            GROUP BY DATE(post_date)
+            UNION ALL
+            SELECT 'week', CAST(YEARWEEK(post_date, 3) AS CHAR), NULL, NULL, COUNT(*)
+            FROM wp_posts WHERE post_type = 'post' AND post_date >= CURDATE() - INTERVAL %s WEEK
+            GROUP BY YEARWEEK(post_date, 3)
+            UNION ALL
+            (SELECT 'recent', post_title, post_status, post_date, NULL
+             FROM wp_posts WHERE post_type = 'post' ORDER BY post_date DESC LIMIT 10)
+        """
+        with self.db_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, [days, weeks])
+            rows = cursor.fetchall()
+            cursor.close()
+        
+        stats = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'cached': False,
+            'status_stats': [],
+            'type_stats': [],
+            'daily': [],
+            'weekly': [],
+            'recent_posts': []
+        }
+        groups = {'status': 'status_stats', 'type': 'type_stats', 'day': 'daily', 'week': 'weekly'}
+        for kind, label, status, date, count in rows:
+            if kind == 'recent':
+                stats['recent_posts'].append([label, str(date), status])
+            else:
+                stats[groups[kind]].append([label, count])
+        
+        stats['daily'].sort()
+        stats['weekly'].sort()
+        return stats
+    
+    def _stats_cache_settings(self):
+        """통계 캐시 파일 경로와 유효 시간(초)"""
+        stats_config = self.config.get('stats', {})
+        return stats_config.get('cache_file', 'wp_stats_cache.json'), stats_config.get('cache_ttl', 60)
+    
+    def _load_cached_stats(self):
+        """유효한 캐시 통계 (없거나 만료되었거나 다른 데이터베이스면 None)"""
+        cache_file, cache_ttl = self._stats_cache_settings()
+        if not cache_file or not cache_ttl:
+            return None
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if (cached['database'] == self._stats_cache_key()
+                    and time.time() - cached['saved_at'] < cache_ttl):
+                return dict(cached['stats'], cached=True)
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+    
+    def _save_cached_stats(self, stats):
+        """통계를 캐시 파일에 저장 (실패해도 무시)"""
+        cache_file, cache_ttl = self._stats_cache_settings()
+        if not cache_file or not cache_ttl:
+            return
+        try:
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'database': self._stats_cache_key(), 'saved_at': time.time(), 'stats': stats},
+                          f, ensure_ascii=False)
+        except OSError:
+            pass
+    
+    def _stats_cache_key(self):
+        """캐시가 어느 데이터베이스의 통계인지 구분하는 키"""
+        return f"{self.db_config.get('host')}:{self.db_config.get('port', 3306)}/{self.db_config.get('database')}"
+    
     def backup_posts_to_json(self, filename=None):
         """포스트를 JSON 파일로 백업"""
         if not filename:
@@ -179,56 +392,315 @@ class WordPressUtils:
             print("백업할 포스트가 없습니다.")
             return None
     
-    def clean_auto_posts(self, dry_run=True):
-        """자동 생성된 포스트 정리 (제목에 번호가 있는 포스트들)"""
+    def backup_posts_to_ndjson(self, filename=None, compression=None, chunk_size=1000, post_type='post'):
+        """포스트를 NDJSON(한 줄에 포스트 하나)으로 스트리밍 백업
+        
+        ID 기준 키셋 페이지네이션으로 chunk_size개씩 읽고, 비버퍼 커서에서
+        한 행씩 바로 파일에 쓰므로 테이블 크기와 관계없이 메모리 사용량이
+        일정합니다. compression은 None, 'gzip', 'zstd' 중 하나입니다.
+        """
+        if not filename:
+            extension = {None: '', 'gzip': '.gz', 'zstd': '.zst'}[compression]
+            filename = f"wp_posts_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson{extension}"
+        
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # 번호로 시작하는 제목의 포스트들 찾기
-            query = """
-                SELECT ID, post_title, post_status, post_date 
-                FROM wp_posts 
-                WHERE post_type = 'post' 
-                AND post_title REGEXP '^[0-9]+\\.'
-                ORDER BY post_date DESC
-            """
-            
-            cursor.execute(query)
-            auto_posts = cursor.fetchall()
-            
-            if not auto_posts:
-                print("자동 생성된 포스트가 없습니다.")
-                return 0
-            
-            print(f"자동 생성된 포스트 {len(auto_posts)}개 발견:")
-            for post_id, title, status, date in auto_posts:
-                print(f"  ID {post_id}: [{status}] {title} ({date})")
+            count, _ = self._write_ndjson(
+                filename, compression, self._iter_post_rows_by_id(post_type, chunk_size)
+            )
             
-            if dry_run:
-                print(f"\n[DRY RUN] 실제 삭제하려면 dry_run=False로 실행하세요.")
-                return 0
-            
-            confirm = input(f"\n{len(auto_posts)}개 포스트를 정말 삭제하시겠습니까? (y/N): ")
-            if confirm.lower() != 'y':
-                print("삭제가 취소되었습니다.")
-                return 0
+            print(f"포스트 {count}개가 {filename}에 백업되었습니다.")
+            return filename
             
-            # 실제 삭제
-            post_ids = [post[0] for post in auto_posts]
-            placeholders = ','.join(['%s'] * len(post_ids))
-            delete_query = f"DELETE FROM wp_posts WHERE ID IN ({placeholders})"
+        except Exception as e:
+            print(f"포스트 백업 실패: {e}")
+            return None
+    
+    def _write_ndjson(self, filename, compression, rows):
+        """행을 한 줄씩 NDJSON으로 쓰고 (행 수, 최대 (post_modified_gmt, ID)) 반환"""
+        count = 0
+        watermark = None
+        with self._open_backup_file(filename, compression) as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False, default=str))
+                f.write('\n')
+                count += 1
+                
+                row_mark = [self._modified_gmt(row), row['ID']]
+                if watermark is None or row_mark > watermark:
+                    watermark = row_mark
+        return count, watermark
+    
+    @staticmethod
+    def _modified_gmt(row):
+        """post_modified_gmt를 비교 가능한 문자열로 (0000-00-00은 None으로 읽힘)"""
+        value = row.get('post_modified_gmt')
+        return str(value) if value else '0000-00-00 00:00:00'
+    
+    def backup_posts_incremental(self, manifest_file='wp_posts_backup_manifest.json', compression=None,
+                                 chunk_size=1000, post_type='post', full=False):
+        """증분 백업: 마지막 백업 이후 바뀐 포스트만 NDJSON으로 저장
+        
+        매니페스트에 전체/증분 백업 파일 목록과 마지막 (post_modified_gmt, ID)
+        워터마크가 기록됩니다. 매니페스트가 없거나 full=True이면 전체 백업으로
+        새 체인을 시작합니다. 삭제된 포스트는 증분에 나타나지 않으므로 다음
+        전체 백업에서 반영됩니다.
+        """
+        manifest = self._load_manifest(manifest_file, post_type)
+        backups = manifest['backups']
+        incremental = bool(backups) and not full
+        
+        timestamp = datetime.now()
+        kind = 'incremental' if incremental else 'full'
+        extension = {None: '', 'gzip': '.gz', 'zstd': '.zst'}[compression]
+        filename = f"wp_posts_{kind}_{timestamp.strftime('%Y%m%d_%H%M%S')}.ndjson{extension}"
+        since = backups[-1]['watermark'] if incremental else None
+        
+        try:
+            if incremental and since is not None:
+                rows = self._iter_post_rows_modified_since(post_type, since, chunk_size)
+            else:
+                rows = self._iter_post_rows_by_id(post_type, chunk_size)
+            count, watermark = self._write_ndjson(filename, compression, rows)
+            
+            backups.append({
+                'file': filename,
+                'type': kind,
+                'compression': compression,
+                'created_at': timestamp.isoformat(),
+                'since': since,
+                # 바뀐 행이 없으면 이전 워터마크 유지
+                'watermark': watermark or since,
+                'count': count
+            })
+            with open(manifest_file, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            
+            label = '증분' if incremental else '전체'
+            print(f"{label} 백업: 포스트 {count}개가 {filename}에 저장되었습니다.")
+            return filename
             
-            cursor.execute(delete_query, post_ids)
-            deleted_count = cursor.rowcount
-            conn.commit()
+        except Exception as e:
+            print(f"증분 백업 실패: {e}")
+            return None
+    
+    @staticmethod
+    def _load_manifest(manifest_file, post_type='post'):
+        """백업 매니페스트 읽기 (없으면 빈 체인)"""
+        if not os.path.exists(manifest_file):
+            return {'post_type': post_type, 'backups': []}
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _iter_post_rows_modified_since(self, post_type, since, chunk_size, overlap=60):
+        """(post_modified_gmt, ID) 키셋으로 워터마크 이후 바뀐 행을 하나씩 생성
+        
+        워터마크와 같은 초에 나중에 바뀐 낮은 ID의 행이나 늦게 커밋된 행을
+        놓치지 않도록 워터마크 overlap초 전부터 다시 읽습니다. 겹쳐 읽은 행은
+        복원할 때 최신 파일부터 ID로 걸러지므로 중복되지 않습니다.
+        """
+        try:
+            start = datetime.strptime(since[0], '%Y-%m-%d %H:%M:%S') - timedelta(seconds=overlap)
+            start = start.strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            start = since[0]
+        last_modified = last_id = None
+        with self.db_pool.connection() as conn:
+            while True:
+                cursor = conn.cursor(dictionary=True, buffered=False)
+                if last_id is None:
+                    cursor.execute(
+                        "SELECT * FROM wp_posts WHERE post_type = %s AND post_modified_gmt >= %s "
+                        "ORDER BY post_modified_gmt, ID LIMIT %s",
+                        [post_type, start, chunk_size]
+                    )
+                else:
+                    cursor.execute(
+                        "SELECT * FROM wp_posts WHERE post_type = %s "
+                        "AND (post_modified_gmt > %s OR (post_modified_gmt = %s AND ID > %s)) "
+                        "ORDER BY post_modified_gmt, ID LIMIT %s",
+                        [post_type, last_modified, last_modified, last_id, chunk_size]
+                    )
+                fetched = 0
+                for row in cursor:
+                    fetched += 1
+                    last_modified, last_id = self._modified_gmt(row), row['ID']
+                    yield row
+                cursor.close()
+                
+                if fetched < chunk_size:
+                    return
+    
+    def restore_backup_snapshot(self, manifest_file='wp_posts_backup_manifest.json', output_file=None,
+                                until=None, compression=None):
+        """백업 체인으로 특정 시점의 스냅샷 NDJSON 생성
+        
+        until(ISO 시각)까지의 백업 중 마지막 전체 백업과 그 뒤 증분들을
+        합칩니다. 최신 파일부터 읽으며 이미 쓴 ID는 건너뛰므로, 메모리에는
+        ID 집합만 유지됩니다.
+        """
+        manifest = self._load_manifest(manifest_file)
+        chain = [b for b in manifest['backups'] if until is None or b['created_at'] <= until]
+        full_indexes = [i for i, b in enumerate(chain) if b['type'] == 'full']
+        if not full_indexes:
+            print("복원할 전체 백업이 없습니다.")
+            return None
+        chain = chain[full_indexes[-1]:]
+        
+        if not output_file:
+            extension = {None: '', 'gzip': '.gz', 'zstd': '.zst'}[compression]
+            output_file = f"wp_posts_snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson{extension}"
+        
+        try:
+            seen_ids = set()
+            count = 0
+            with self._open_backup_file(output_file, compression) as out:
+                for backup in reversed(chain):
+                    with self._open_backup_file(backup['file'], backup.get('compression'), mode='r') as f:
+                        for line in f:
+                            post_id = json.loads(line)['ID']
+                            if post_id in seen_ids:
+                                continue
+                            seen_ids.add(post_id)
+                            out.write(line)
+                            count += 1
+            
+            print(f"백업 {len(chain)}개를 합쳐 포스트 {count}개를 {output_file}에 복원했습니다.")
+            return output_file
             
-            cursor.close()
-            conn.close()
+        except Exception as e:
+            print(f"스냅샷 복원 실패: {e}")
+            return None
+    
+    def _iter_post_rows_by_id(self, post_type, chunk_size):
+        """ID 키셋 페이지네이션으로 포스트 행을 하나씩 생성 (OFFSET 없음)"""
+        with self.db_pool.connection() as conn:
+            last_id = 0
+            while True:
+                # 비버퍼 커서: 행을 가져오는 대로 하나씩 넘김
+                cursor = conn.cursor(dictionary=True, buffered=False)
+                cursor.execute(
+                    "SELECT * FROM wp_posts WHERE post_type = %s AND ID > %s ORDER BY ID LIMIT %s",
+                    [post_type, last_id, chunk_size]
+                )
+                fetched = 0
+                for row in cursor:
+                    fetched += 1
+                    last_id = row['ID']
+                    yield row
+                cursor.close()
+                
+                if fetched < chunk_size:
+                    return
+    
+    @staticmethod
+    def _open_backup_file(filename, compression=None, mode='w'):
+        """압축 방식에 맞는 텍스트 파일 열기 (mode는 'w' 또는 'r')"""
+        if compression is None:
+            return open(filename, mode, encoding='utf-8')
+        if compression == 'gzip':
+            return gzip.open(filename, mode + 't', encoding='utf-8')
+        if compression == 'zstd':
+            try:
+                import zstandard
+            except ImportError:
+                raise RuntimeError("zstd 압축에는 zstandard 패키지가 필요합니다: pip install zstandard")
+            raw = open(filename, mode + 'b')
+            if mode == 'r':
+                stream = zstandard.ZstdDecompressor().stream_reader(raw)
+            else:
+                stream = zstandard.ZstdCompressor().stream_writer(raw)
+            return io.TextIOWrapper(stream, encoding='utf-8')
+        raise ValueError(f"지원하지 않는 압축 방식입니다: {compression}")
+    
+    def _marked_posts_query(self, columns, source=None):
+        """자동 포스팅 표시가 있는 포스트를 찾는 쿼리와 인자 (뒤에 AND 조건을 붙일 수 있음)
+        
+        자동 포스팅 태그(wp_terms.slug)나 원본 메타(meta_key)로 찾으므로 인덱스만
+        탑니다. source를 주면 해당 파일의 원본 메타가 있는 포스트만 찾습니다.
+        """
+        if source:
+            # 파일명의 %, _가 와일드카드로 해석되지 않도록 이스케이프
+            escaped = source.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            marked = "SELECT post_id AS ID FROM wp_postmeta WHERE meta_key = %s AND meta_value LIKE %s"
+            params = [SOURCE_META_KEY, f"{escaped}#%"]
+        else:
+            marked = """
+                SELECT r.object_id AS ID
+                FROM wp_terms t
+                JOIN wp_term_taxonomy tt ON tt.term_id = t.term_id AND tt.taxonomy = 'post_tag'
+                JOIN wp_term_relationships r ON r.term_taxonomy_id = tt.term_taxonomy_id
+                WHERE t.slug = %s
+                UNION
+                SELECT post_id FROM wp_postmeta WHERE meta_key = %s
+            """
+            params = [AUTO_POST_TAG_SLUG, SOURCE_META_KEY]
+        query = f"""
+            SELECT {columns}
+            FROM ({marked}) marked
+            JOIN wp_posts p ON p.ID = marked.ID
+            WHERE p.post_type = 'post'
+        """
+        return query, params
+    
+    def clean_auto_posts(self, dry_run=True, source=None, legacy=False):
+        """자동 생성된 포스트 정리
+        
+        wp_auto_poster.py가 붙인 자동 포스팅 태그나 원본 메타로 찾으며, source를
+        주면 해당 파일에서 만든 포스트만 찾습니다 (tag_source_meta 필요). legacy는
+        표시가 없는 이전 포스트를 제목 패턴(번호로 시작)으로 찾습니다.
+        """
+        try:
+            with self.db_pool.connection() as conn:
+                cursor = conn.cursor()
+                
+                if legacy:
+                    # 번호로 시작하는 제목의 포스트들 찾기 (wp_posts 전체 스캔)
+                    query = """
+                        SELECT ID, post_title, post_status, post_date 
+                        FROM wp_posts 
+                        WHERE post_type = 'post' 
+                        AND post_title REGEXP '^[0-9]+\\.'
+                        ORDER BY post_date DESC
+                    """
+                    params = []
+                else:
+                    query, params = self._marked_posts_query(
+                        "p.ID, p.post_title, p.post_status, p.post_date", source
+                    )
+                    query += " ORDER BY p.post_date DESC"
+                
+                cursor.execute(query, params)
+                auto_posts = cursor.fetchall()
+                
+                if not auto_posts:
+                    print("자동 생성된 포스트가 없습니다.")
+                    if source:
+                        print("--source는 tag_source_meta로 원본 메타를 기록한 포스트만 찾습니다.")
+                    elif not legacy:
+                        print("표시(tag_posts) 없이 만든 이전 포스트는 --legacy로 찾을 수 있습니다.")
+                    return 0
+                
+                print(f"자동 생성된 포스트 {len(auto_posts)}개 발견:")
+                for post_id, title, status, date in auto_posts:
+                    print(f"  ID {post_id}: [{status}] {title} ({date})")
+                
+                if dry_run:
+                    print(f"\n[DRY RUN] 실제 삭제하려면 dry_run=False로 실행하세요.")
+                    return 0
+                
+                confirm = input(f"\n{len(auto_posts)}개 포스트를 정말 삭제하시겠습니까? (y/N): ")
+                if confirm.lower() != 'y':
+                    print("삭제가 취소되었습니다.")
+                    return 0
+                
+                cursor.close()
+                
+            # 실제 삭제 (관련 메타/분류/댓글 포함)
+            deleted_count = self.delete_posts_by_ids([post[0] for post in auto_posts])
             
             print(f"{deleted_count}개 포스트가 삭제되었습니다.")
             return deleted_count
-            
+                
         except Exception as e:
             print(f"포스트 정리 실패: {e}")
             return 0
@@ -239,10 +711,31 @@ def main():
     
     parser = argparse.ArgumentParser(description='WordPress 유틸리티')
     parser.add_argument('--stats', action='store_true', help='포스트 통계 조회')
+    parser.add_argument('--json', action='store_true', help='--stats 결과를 JSON 한 줄로 출력 (모니터링용)')
+    parser.add_argument('--no-cache', action='store_true', help='--stats에서 캐시를 무시하고 새로 조회')
     parser.add_argument('--backup', action='store_true', help='포스트 백업')
+    parser.add_argument('--backup-stream', action='store_true',
+                        help='포스트를 NDJSON으로 스트리밍 백업 (대용량 사이트용)')
+    parser.add_argument('--compress', choices=['gzip', 'zstd'], help='스트리밍 백업 압축 방식')
+    parser.add_argument('--chunk-size', type=int,
+                        help='한 번에 처리할 행 수 (백업 기본값 1000, 삭제/상태 변경은 maintenance.chunk_size)')
+    parser.add_argument('--throttle', type=float,
+                        help='삭제/상태 변경 청크 사이 대기 시간(초, 기본값 maintenance.chunk_sleep)')
+    parser.add_argument('--backup-incremental', action='store_true',
+                        help='마지막 백업 이후 바뀐 포스트만 백업 (처음에는 전체 백업)')
+    parser.add_argument('--full', action='store_true', help='--backup-incremental에서 새 전체 백업으로 시작')
+    parser.add_argument('--manifest', help='증분 백업 매니페스트 파일 (기본값 wp_posts_backup_manifest.json)')
+    parser.add_argument('--restore-snapshot', metavar='OUTPUT',
+                        help='백업 체인을 합쳐 특정 시점의 스냅샷 NDJSON 생성')
+    parser.add_argument('--until', help='스냅샷 시점 (ISO 형식, 예: 2024-01-31T23:59:59)')
     parser.add_argument('--clean', action='store_true', help='자동 포스트 정리 (dry run)')
     parser.add_argument('--clean-force', action='store_true', help='자동 포스트 정리 (실제 삭제)')
+    parser.add_argument('--source', help='--clean/--clean-force에서 이 파일(예: post.txt)로 만든 포스트만 정리')
+    parser.add_argument('--legacy', action='store_true',
+                        help='--clean/--clean-force에서 표시가 없는 이전 포스트를 제목 패턴으로 찾기')
     parser.add_argument('--delete-pattern', help='제목 패턴으로 포스트 삭제')
+    parser.add_argument('--tagged-only', action='store_true',
+                        help='--delete-pattern에서 자동 포스팅으로 만든 포스트만 대상')
     parser.add_argument('--publish', nargs='+', type=int, help='포스트 ID들을 발행 상태로 변경')
     parser.add_argument('--draft', nargs='+', type=int, help='포스트 ID들을 초안 상태로 변경')
     
@@ -250,21 +743,39 @@ def main():
     
     try:
         utils = WordPressUtils()
+        if args.chunk_size:
+            utils.chunk_size = args.chunk_size
+        if args.throttle is not None:
+            utils.chunk_sleep = args.throttle
         
         if args.stats:
-            utils.get_post_statistics()
+            utils.get_post_statistics(use_cache=not args.no_cache, as_json=args.json)
         
         if args.backup:
             utils.backup_posts_to_json()
         
+        if args.backup_stream:
+            utils.backup_posts_to_ndjson(compression=args.compress, chunk_size=args.chunk_size or 1000)
+        
+        manifest_file = args.manifest or 'wp_posts_backup_manifest.json'
+        if args.backup_incremental:
+            utils.backup_posts_incremental(
+                manifest_file, compression=args.compress,
+                chunk_size=args.chunk_size or 1000, full=args.full
+            )
+        
+        if args.restore_snapshot:
+            utils.restore_backup_snapshot(manifest_file, args.restore_snapshot, until=args.until,
+                                          compression=args.compress)
+        
         if args.clean:
-            utils.clean_auto_posts(dry_run=True)
+            utils.clean_auto_posts(dry_run=True, source=args.source, legacy=args.legacy)
         
         if args.clean_force:
-            utils.clean_auto_posts(dry_run=False)
+            utils.clean_auto_posts(dry_run=False, source=args.source, legacy=args.legacy)
         
         if args.delete_pattern:
-            utils.delete_posts_by_title_pattern(args.delete_pattern)
+            utils.delete_posts_by_title_pattern(args.delete_pattern, tagged_only=args.tagged_only)
         
         if args.publish:
             utils.update_post_status(args.publish, 'publish')